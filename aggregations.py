@@ -0,0 +1,107 @@
+"""Zestawienia konfiguracji liczone z jednej, wstępnie zagregowanej kostki.
+
+Kostkę (liczba sztuk na najdrobniejszym poziomie: producent x tags x CPU x
+model CPU x grafika x dotyk) budujemy raz na snapshot. Model CPU i grafika to
+kanoniczne klucze z ``specs`` - różne zapisy tej samej części są jedną grupą. Każde grubsze
+grupowanie i filtr po producencie / modelach / minimalnej liczbie sztuk
+działa na kilku tysiącach wierszy kostki zamiast na wszystkich egzemplarzach.
+"""
+import numpy as np
+import pandas as pd
+
+from labels import TOUCH_LABEL, LabelMatrix
+from specs import CPU_GENERATION, CPU_KEY, CPU_VENDOR, GPU_KEY, cpu_mask
+
+COUNT = "Ilość sztuk"
+TOUCH_COL = "Dotyk_flag"
+TOUCH_VALUES = ["Brak dotyku", "Dotyk"]  # kolejność alfabetyczna, jak przy sortowaniu napisów
+
+CUBE_COLUMNS = [
+    "Model_Glowny",
+    "tags",
+    "Procesor (drop down)",
+    CPU_KEY,
+    GPU_KEY,
+    # Wynikają z klucza CPU - nie zwiększają kostki, a pozwalają filtrować po generacji
+    CPU_VENDOR,
+    CPU_GENERATION,
+    TOUCH_COL,
+]
+
+
+def touch_flags(df: pd.DataFrame) -> pd.Categorical:
+    touch = LabelMatrix(df["Matryca (labels)"]).mask(any_of=[TOUCH_LABEL])
+    return pd.Categorical.from_codes(touch.astype(np.int8), categories=TOUCH_VALUES)
+
+
+def build_config_cube(df: pd.DataFrame) -> pd.DataFrame:
+    frame = df[CUBE_COLUMNS[:-1]].assign(**{TOUCH_COL: touch_flags(df)})
+    return (
+        frame
+        .groupby(CUBE_COLUMNS, dropna=False, observed=True)
+        .size()
+        .reset_index(name=COUNT)
+    )
+
+
+def filter_cube(cube: pd.DataFrame, main_model=None, models=None,
+                cpu_vendor=None, min_generation: int = 0) -> pd.DataFrame:
+    mask = cpu_mask(cube, cpu_vendor, min_generation)
+    if main_model is not None:
+        mask &= (cube["Model_Glowny"] == main_model).to_numpy()
+    if models:
+        mask &= cube["tags"].isin(models).to_numpy()
+    return cube[mask]
+
+
+def rollup(cube: pd.DataFrame, group_cols: list, main_model=None, models=None,
+           min_qty: int = 1, dropna: bool = False, cpu_vendor=None,
+           min_generation: int = 0) -> pd.DataFrame:
+    """Zgrubne grupowanie z kostki: suma sztuk po ``group_cols``."""
+    grouped = (
+        filter_cube(cube, main_model, models, cpu_vendor, min_generation)
+        .groupby(group_cols, dropna=dropna, observed=True)[COUNT]
+        .sum()
+        .reset_index()
+    )
+    if min_qty > 1:
+        grouped = grouped[grouped[COUNT] >= min_qty]
+    return grouped
+
+
+def configurations_summary(cube: pd.DataFrame, cpu_model: bool = True, gpu: bool = True,
+                           **filters) -> pd.DataFrame:
+    """Zestawienie konfiguracji: tags + procesor (+ model CPU, + grafika) + dotyk.
+
+    ``filters`` jak w ``rollup`` (producent, modele, minimalna liczba sztuk, CPU).
+    """
+    group_cols = ["tags", "Procesor (drop down)"]  # model + typ CPU zawsze
+    if cpu_model:
+        group_cols.append(CPU_KEY)
+    if gpu:
+        group_cols.append(GPU_KEY)
+    group_cols.append(TOUCH_COL)  # zawsze rozróżniamy dotyk / brak dotyku (z etykiety "Dotyk")
+
+    # sortujemy po modelu, procesorze, dotyku
+    return rollup(cube, group_cols, **filters).sort_values(by=["tags", "Procesor (drop down)", TOUCH_COL])
+
+
+def models_summary(cube: pd.DataFrame) -> pd.DataFrame:
+    """Tagi + procesor + model (malejąco) - jak ``value_counts`` z pominięciem braków."""
+    summary = (
+        rollup(cube, ["tags", "Procesor (drop down)", CPU_KEY], dropna=True)
+        .sort_values(COUNT, ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+    summary.columns = ["Tag", "Procesor", "Model Procesora", "Liczba"]
+    return summary
+
+
+def tags_summary(cube: pd.DataFrame) -> pd.DataFrame:
+    summary = (
+        rollup(cube, ["tags"], dropna=True)
+        .sort_values(COUNT, ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+    summary.columns = ["Tag", "Liczba egzemplarzy"]
+    return summary
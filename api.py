@@ -0,0 +1,270 @@
+"""API JSON z tymi samymi filtrami i zestawieniami co strony Streamlit.
+
+Jeden proces trzyma jeden współdzielony snapshot (``get_snapshot``) i jego
+indeksy - CSV nie jest czytany ponownie przy kolejnych zapytaniach, a
+odpowiedzi trafiają do wspólnego cache wyników (``result_cache``) per
+(endpoint, parametry, wersja danych).
+
+    python api.py --port 8502
+    curl 'localhost:8502/api/count?tag=Dell%20Precision%205540&processor=i7&destinations=Magazyn'
+
+Endpointy (parametry filtrów jak w URL ``app.py``: ``tag``, ``processor``,
+``processor_model``, ``resolution``, ``destinations`` (wiele), ``list``,
+etykiety ``matryca``/``klawiatura``/... (wiele) i ``q``; tagi (``tag``,
+``models``, ``main_model``) bez względu na wielkość liter, nawiasy ``[...]`` opcjonalne):
+
+    /api/health           wersja danych, liczba wierszy
+    /api/count            liczba pozycji po filtrach
+    /api/items            pozycje po filtrach (``limit``, ``offset``, ``sort``, ``desc``, ``columns``)
+    /api/facets           wartości osiągalne w każdym filtrze + liczba sztuk
+    /api/models           tagi + procesor + model (jak ``spr-czy-modele-wystawione.py``)
+    /api/configurations   zestawienie konfiguracji (jak skrypt filtrowania): ``main_model``,
+                          ``models`` (wiele), ``cpu_model``/``gpu`` (0/1), ``min_qty``,
+                          ``cpu_vendor``, ``min_generation``
+"""
+import argparse
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from aggregations import build_config_cube, configurations_summary, models_summary
+from csv_stream import SchemaError
+from data_loader import FILE_PATH, SEPARATOR, get_snapshot, source_columns
+from filter_index import ALL, FILTER_COLUMNS, FilterIndex, filters_from_params, normalize_tag, selections_from_params
+from labels import build_label_matrices, label_filter_mask, labels_from_params
+from result_cache import ResultCache, shared_cache
+from search import SEARCH_PARAM, SearchIndex, rank
+from table_view import SortIndex, window
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _param(params: dict, name: str, default=None):
+    return params.get(name, [default])[0]
+
+
+def _int_param(params: dict, name: str, default: int, minimum: int = 0, maximum: int = None) -> int:
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise BadRequest(f"Parametr {name} musi być liczbą całkowitą") from None
+    if value < minimum or (maximum is not None and value > maximum):
+        raise BadRequest(f"Parametr {name} poza zakresem")
+    return value
+
+
+def _flag_param(params: dict, name: str, default: bool = True) -> bool:
+    value = _param(params, name)
+    return default if value is None else value.lower() not in ("0", "false", "nie")
+
+
+def _records(frame: pd.DataFrame) -> list:
+    # to_json zamienia braki (NaN, NA, NaT) na null i daty na ISO
+    return json.loads(frame.to_json(orient="records", force_ascii=False, date_format="iso"))
+
+
+def _json_value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def select_rows(snapshot, params: dict):
+    """Filtry, etykiety i wyszukiwanie z parametrów -> (pozycje wierszy, filtry, maska dodatkowa)."""
+    filter_index = snapshot.derived("filter_index", FilterIndex)
+    extra = label_filter_mask(snapshot.derived("label_matrices", build_label_matrices), labels_from_params(params))
+
+    query = (_param(params, SEARCH_PARAM) or "").strip()
+    scores = snapshot.derived("search_index", SearchIndex).scores(query) if query else None
+    if scores is not None:
+        extra = scores > 0 if extra is None else extra & (scores > 0)
+
+    selected = filters_from_params(params)
+    rows = filter_index.rows(selections_from_params(selected), extra=extra)
+    if scores is not None:
+        rows = rank(rows, scores)
+    return rows, selected, extra
+
+
+def health(snapshot, params: dict) -> dict:
+    return {"status": "ok", "version": snapshot.version, "rows": len(snapshot.df)}
+
+
+def count(snapshot, params: dict) -> dict:
+    rows, selected, _ = select_rows(snapshot, params)
+    return {"count": int(len(rows)), "filters": selected}
+
+
+def items(snapshot, params: dict) -> dict:
+    df = snapshot.df
+    rows, selected, _ = select_rows(snapshot, params)
+
+    columns = params.get("columns") or source_columns(df)
+    unknown = [c for c in columns if c not in df.columns]
+    if unknown:
+        raise BadRequest(f"Nieznane kolumny: {', '.join(unknown)}")
+    sort_col = _param(params, "sort")
+    if sort_col is not None:
+        if sort_col not in df.columns:
+            raise BadRequest(f"Nieznana kolumna sortowania: {sort_col}")
+        rows = snapshot.derived("sort_index", SortIndex).sorted_rows(
+            rows, sort_col, ascending=not _flag_param(params, "desc", default=False)
+        )
+
+    limit = _int_param(params, "limit", DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    offset = _int_param(params, "offset", 0)
+    return {
+        "count": int(len(rows)),
+        "offset": offset,
+        "filters": selected,
+        "items": _records(window(df, rows, offset, offset + limit, columns)),
+    }
+
+
+def facets(snapshot, params: dict) -> dict:
+    filter_index = snapshot.derived("filter_index", FilterIndex)
+    _, selected, extra = select_rows(snapshot, params)
+    by_column = filter_index.facets(selections_from_params(selected), extra)
+    return {
+        "filters": selected,
+        "facets": {
+            name: [[_json_value(value), n] for value, n in by_column[col]]
+            for name, col in FILTER_COLUMNS.items()
+        },
+    }
+
+
+def models(snapshot, params: dict) -> dict:
+    summary = models_summary(snapshot.derived("config_cube", build_config_cube))
+    return {"count": len(summary), "models": _records(summary)}
+
+
+def _main_model(cube: pd.DataFrame, value: str) -> str:
+    """``"Dell"`` -> ``"[dell"`` - wartość ``Model_Glowny`` (pierwsze słowo tagów) o tym samym zapisie."""
+    key = normalize_tag(value)
+    for main_model in cube["Model_Glowny"].dropna().unique():
+        if normalize_tag(main_model) == key:
+            return main_model
+    return key
+
+
+def configurations(snapshot, params: dict) -> dict:
+    cube = snapshot.derived("config_cube", build_config_cube)
+    main_model = _param(params, "main_model", ALL)
+    cpu_vendor = _param(params, "cpu_vendor", ALL)
+    grouped = configurations_summary(
+        cube,
+        cpu_model=_flag_param(params, "cpu_model"),
+        gpu=_flag_param(params, "gpu"),
+        main_model=None if main_model == ALL else _main_model(cube, main_model),
+        # Tagi jak w filtrze ``tag``: bez względu na wielkość liter, nawiasy opcjonalne
+        models=[normalize_tag(model) for model in params.get("models", [])],
+        min_qty=_int_param(params, "min_qty", 1, minimum=1),
+        cpu_vendor=None if cpu_vendor == ALL else cpu_vendor,
+        min_generation=_int_param(params, "min_generation", 0),
+    )
+    return {"count": len(grouped), "configurations": _records(grouped)}
+
+
+ROUTES = {
+    "/api/health": health,
+    "/api/count": count,
+    "/api/items": items,
+    "/api/facets": facets,
+    "/api/models": models,
+    "/api/configurations": configurations,
+}
+
+
+def make_handler(csv_path: str = FILE_PATH, sep: str = SEPARATOR, cache: ResultCache = None):
+    cache = cache if cache is not None else shared_cache()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_body(self, status, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status, payload):
+            self._send_body(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            route = ROUTES.get(url.path.rstrip("/"))
+            if route is None:
+                self._send_json(404, {"error": "Nieznany endpoint", "endpoints": list(ROUTES)})
+                return
+            params = parse_qs(url.query)
+            try:
+                # Snapshot współdzielony przez wszystkie wątki; po zmianie pliku nowa wersja
+                snapshot = get_snapshot(csv_path, sep)
+                if route is health:
+                    self._send_json(200, {**health(snapshot, params), "cache": cache.stats()})
+                    return
+                # Gotowa odpowiedź per (endpoint, wersja danych, parametry) - wspólna z innymi wątkami
+                body = cache.get_or_compute(
+                    f"api_{route.__name__}", snapshot.version, params,
+                    lambda: json.dumps(route(snapshot, params), ensure_ascii=False).encode("utf-8"),
+                )
+            except BadRequest as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except FileNotFoundError:
+                self._send_json(503, {"error": f"Nie znaleziono pliku: {csv_path}"})
+                return
+            except SchemaError as e:
+                # Eksport ze zmienionymi kolumnami - dane niedostępne do czasu poprawnego pliku
+                self._send_json(503, {"error": f"Niepoprawny plik {csv_path}: {e}"})
+                return
+            except Exception as e:
+                # Klient zawsze dostaje odpowiedź JSON; szczegóły w logu serwera
+                logger.exception("Błąd obsługi %s", self.path)
+                self._send_json(500, {"error": f"Błąd serwera: {e}"})
+                return
+            self._send_body(200, body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(csv_path: str = FILE_PATH, sep: str = SEPARATOR, host: str = "127.0.0.1", port: int = 8502):
+    server = ThreadingHTTPServer((host, port), make_handler(csv_path, sep))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=FILE_PATH)
+    parser.add_argument("--sep", default=SEPARATOR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    # Wczytanie przed startem - pierwszy klient nie czeka na parsowanie CSV
+    get_snapshot(args.csv, args.sep)
+    server = serve(args.csv, args.sep, args.host, args.port)
+    print(f"API magazynu na http://{args.host}:{args.port}/api")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""Benchmark etapów dashboardów na syntetycznych eksportach ClickUp.
+
+Generuje eksport z tymi samymi 18 kolumnami co ``nazwa_pliku.csv``
+(listy etykiet w nawiasach, braki, polskie znaki, wieloliniowe uwagi)
+i mierzy poza Streamlitem czas oraz szczytową pamięć każdego etapu:
+
+    python benchmark.py --rows 10000 100000 1000000 > bench_output.txt
+
+Czas to najlepszy z ``--repeat`` przebiegów; pamięć to szczyt alokacji
+(tracemalloc) w osobnym przebiegu, więc nie zawyża czasu. tracemalloc widzi
+alokacje Pythona i numpy, ale nie bufory Arrow (etapy snapshotu).
+"""
+import argparse
+import csv
+import gc
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from aggregations import build_config_cube, rollup
+from csv_stream import EXPORT_COLUMNS
+from data_loader import normalize, read_snapshot, to_typed, write_snapshot
+from export import to_excel_bytes
+from filter_index import FILTER_COLUMNS, FilterIndex
+from history import HistoryStore
+from ingest import stream_to_snapshot
+from labels import build_label_matrices
+from model_coverage import catalog_template, coverage, read_catalog
+from search import SearchIndex
+from specs import GPU_KEY
+from table_view import SortIndex, window
+
+COLUMNS = EXPORT_COLUMNS
+
+MODELS = [
+    "dell precision 3541", "dell precision 5540", "dell precision 7520", "dell precision 7530",
+    "dell latitude 7490", "dell latitude 5400", "lenovo thinkpad p50", "lenovo thinkpad t14 gen 1",
+    "lenovo thinkpad x395", "lenovo thinkpad p15s", "lenovo thinkpad l570", "hp elitebook 840 g6",
+    "hp elitebook 840 g8", "hp zbook 15 g5", "hp probook 450 g7", "fujitsu lifebook u749",
+    "apple macbook pro 2019",
+]
+DESTINATIONS = ["Przyjęcie", "Magazyn", "Serwis", "Sklep", "Pojedyncze", "Malarnia", "Gotowe do wysyłki"]
+CPUS = {
+    "i5": ["8265U", "8365u", "10310U", "1145G7", "6300U"],
+    "i7": ["9750H", "8850H", "7920HQ", "1165G7", "10610U"],
+    "i9": ["9880H", "8950HK"],
+    "AMD": ["Ryzen 5 PRO 4650U", "ryzen 7 pro 5850u", "3500U"],
+    "Xeon": ["E-2176M"],
+    "i3": ["7100U"],
+}
+GPUS = ["Nvidia Quadro T1000", "Nvidia Quadro P620", "T2000 Quadro", "RTX 3000", "Radeon Vega 8", "Intel 630"]
+RAM = ["8", "16", "32", "64", "4", "Brak"]
+DISKS = ["256", "512", "1000", "128", "BRAK", "1000 + 1000"]
+RESOLUTIONS = ["1920 x 1080", "1366 x 768", "3840 x 2160", "1920 x 1200"]
+KEYBOARD = ["QWERTY PL", "Francuska", "Niemiecka", "Brytyjska", "Podświetlana", "Pionowy Enter ISO / EU", "Niekompletna"]
+CASE = ["Ok", "Pęknięcie / Uszczerbek", "Klapa ma otarcia", "Nowy palmrest", "Wgniotka / Odstaje"]
+SCREEN = ["Bez wad", "Dotyk", "Mikro otarcia", "Zwykłe poświatki", "Zwykłe ryski / otarcia", "Wielka rysa / rysy"]
+PROBLEMS = ["TA0", "Palmrest", "Touchpad", "Ramka Matrycy", "Hasło Bios", "Bateria X"]
+NOTES = [
+    "drobny uszczerbek od spodu koło śruby, \n",
+    " POŁAMANA OBUDOWA \nbrakuje zatrzasku od klawisza 5",
+    "luźne klawisze (złamane mocowania)",
+    "pęknięty spód\n",
+    "DZIAŁA BARDZO GŁOŚNO\n",
+]
+LISTS = [f"{d:02d}.{m:02d}.2{y} DOSTAWA {i} -" for i, (d, m, y) in enumerate(
+    [(24, 10, 3), (20, 11, 3), (2, 1, 4), (11, 3, 4), (5, 4, 4), (1, 7, 4), (12, 9, 5), (30, 4, 6)]
+)]
+
+
+def _choice(rng, values, n, na_rate=0.0):
+    result = np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+    if na_rate:
+        result[rng.random(n) < na_rate] = None
+    return result
+
+
+def _label_lists(rng, vocabulary, n, max_labels, na_rate):
+    # Kombinacje etykiet losujemy z ograniczonej puli - jak w ClickUp, gdzie
+    # powtarza się kilkadziesiąt zestawów
+    pool = [
+        "[" + ", ".join(rng.choice(vocabulary, rng.integers(1, max_labels + 1), replace=False)) + "]"
+        for _ in range(60)
+    ]
+    return _choice(rng, pool, n, na_rate)
+
+
+def generate_export(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    processors = _choice(rng, list(CPUS), n_rows, na_rate=0.1)
+    cpu_models = np.array([
+        None if p is None else CPUS[p][i % len(CPUS[p])]
+        for p, i in zip(processors, rng.integers(0, 5, n_rows))
+    ], dtype=object)
+
+    alphabet = np.array(list("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789"))
+    names = ["".join(chars) for chars in alphabet[rng.integers(0, len(alphabet), (n_rows, 7))]]
+
+    return pd.DataFrame({
+        "Task ID": [f"86{i:07x}" for i in rng.permutation(n_rows * 4)[:n_rows]],
+        "Task Name": names,
+        "tags": _choice(rng, [f"[{m}]" for m in MODELS], n_rows, na_rate=0.0002),
+        "Przeznaczenie (drop down)": _choice(rng, DESTINATIONS, n_rows, na_rate=0.002),
+        "Klawiatura (labels)": _label_lists(rng, KEYBOARD, n_rows, 4, 0.08),
+        "Obudowa (labels)": _label_lists(rng, CASE, n_rows, 2, 0.85),
+        "Procesor (drop down)": processors,
+        "Model Procesora (short text)": cpu_models,
+        "Grafika (short text)": _choice(rng, GPUS, n_rows, na_rate=0.9),
+        "RAM (drop down)": _choice(rng, RAM, n_rows, na_rate=0.11),
+        "Dysk (drop down)": _choice(rng, DISKS, n_rows, na_rate=0.14),
+        "Rozdzielczość (drop down)": _choice(rng, RESOLUTIONS, n_rows, na_rate=0.77),
+        "Matryca (labels)": _label_lists(rng, SCREEN, n_rows, 2, 0.08),
+        "Problemy (labels)": _label_lists(rng, PROBLEMS, n_rows, 2, 0.5),
+        "Uwagi (text)": _choice(rng, NOTES, n_rows, na_rate=0.9),
+        "Regał (drop down)": _choice(rng, ["1", "2", "3", "7", "8", "12"], n_rows, na_rate=0.98),
+        "Lists": _choice(rng, [f"[{name}]" for name in LISTS], n_rows),
+        "Zamówienie (short text)": _choice(rng, ["206535473", "68075", "37803 ", "trup"], n_rows, na_rate=0.99),
+    }, columns=COLUMNS)
+
+
+def write_export(df: pd.DataFrame, path: str):
+    # ClickUp cytuje wszystkie pola
+    df.to_csv(path, index=False, quoting=csv.QUOTE_ALL, encoding="utf-8")
+
+
+def _legacy_filter_chain(df, selections):
+    filtered = df.copy()
+    for col, value in selections.items():
+        if isinstance(value, list):
+            if value:
+                filtered = filtered[filtered[col].isin(value)]
+        elif value != "Wszystkie":
+            filtered = filtered[filtered[col].isna()] if pd.isna(value) else filtered[filtered[col] == value]
+    return filtered
+
+
+def build_stages(csv_path: str, tmp_dir: str, excel_rows: int):
+    """Etapy w kolejności jak w skryptach; każdy dostaje i uzupełnia ``ctx``."""
+    snap_path = os.path.join(tmp_dir, "snapshot.parquet")
+
+    def csv_load(ctx):
+        ctx["raw"] = pd.read_csv(csv_path, sep=",", encoding="utf-8", on_bad_lines="skip")
+        return len(ctx["raw"])
+
+    def csv_stream_ingest(ctx):
+        # Walidacja + normalizacja + zapis porcjami: szczyt pamięci to jedna porcja
+        return stream_to_snapshot(csv_path, os.path.join(tmp_dir, "stream.parquet")).rows_ok
+
+    def normalize_stage(ctx):
+        ctx["df"] = to_typed(normalize(ctx["raw"].copy()))
+        return len(ctx["df"])
+
+    def snapshot_write(ctx):
+        write_snapshot(ctx["df"], snap_path)
+        return len(ctx["df"])
+
+    def snapshot_load(ctx):
+        return len(read_snapshot(snap_path))
+
+    def sidebar_unique(ctx):
+        return sum(len(ctx["df"][col].unique()) for col in FILTER_COLUMNS.values())
+
+    def selections(ctx):
+        df = ctx["df"]
+        ctx["selections"] = {
+            "tags": df["tags"].mode()[0],
+            "Procesor (drop down)": df["Procesor (drop down)"].mode()[0],
+            "Przeznaczenie (drop down)": ["Magazyn", "Sklep"],
+        }
+        return len(df)
+
+    def filter_chain_legacy(ctx):
+        return len(_legacy_filter_chain(ctx["df"], ctx["selections"]))
+
+    def filter_index_build(ctx):
+        ctx["index"] = FilterIndex(ctx["df"])
+        return len(ctx["df"])
+
+    def filter_index_rows(ctx):
+        ctx["rows"] = ctx["index"].rows(ctx["selections"])
+        return len(ctx["rows"])
+
+    def facets(ctx):
+        return sum(len(f) for f in ctx["index"].facets(ctx["selections"]).values())
+
+    def labels_build(ctx):
+        ctx["labels"] = build_label_matrices(ctx["df"])
+        return len(ctx["df"])
+
+    def search_build(ctx):
+        ctx["search"] = SearchIndex(ctx["df"])
+        return len(ctx["search"].vocabulary)
+
+    def search_query(ctx):
+        # Literówka w numerze seryjnym (dwa ostatnie znaki zamienione)
+        name = str(ctx["df"]["Task Name"].iloc[len(ctx["df"]) // 2])
+        return len(ctx["search"].search(name[:-2] + name[-1] + name[-2]))
+
+    def groupby_legacy(ctx):
+        df = ctx["df"]
+        touch = df["Matryca (labels)"].astype(str).str.contains("dotyk", case=False, na=False)
+        grouped = (
+            df.assign(Dotyk_flag=touch.map({True: "Dotyk", False: "Brak dotyku"}))
+            .groupby(["tags", "Procesor (drop down)", "Model Procesora (short text)",
+                      "Grafika (short text)", "Dotyk_flag"], dropna=False, observed=True)
+            .size()
+        )
+        return len(grouped)
+
+    def cube_build(ctx):
+        ctx["cube"] = build_config_cube(ctx["df"])
+        return len(ctx["cube"])
+
+    def cube_rollup(ctx):
+        return len(rollup(ctx["cube"], ["tags", "Procesor (drop down)", "Dotyk_flag"], min_qty=2))
+
+    def catalog_coverage(ctx):
+        # Katalog z co drugiej konfiguracji ze stanu, co trzecia z dowolną grafiką
+        catalog = catalog_template(ctx["cube"]).iloc[::2]
+        catalog.loc[catalog.index[::3], GPU_KEY] = ""
+        rows = read_catalog(io.BytesIO(catalog.to_csv(index=False).encode("utf-8")))
+        return len(coverage(ctx["cube"], rows).to_frame())
+
+    def table_page(ctx):
+        ctx["sort_index"] = ctx.get("sort_index") or SortIndex(ctx["df"])
+        rows = ctx["sort_index"].sorted_rows(ctx["rows"], "Task Name")
+        return len(window(ctx["df"], rows, 0, 100))
+
+    def history_add(ctx):
+        # Dwa importy: drugi bez 1% pozycji i z 5% przeniesionych na inny regał
+        df = ctx["df"]
+        rng = np.random.default_rng(0)
+        later = df[rng.random(len(df)) > 0.01].reset_index(drop=True)
+        moved = rng.random(len(later)) < 0.05
+        later["Regał (drop down)"] = later["Regał (drop down)"].astype(object).mask(moved, "99")
+        shutil.rmtree(os.path.join(tmp_dir, "historia"), ignore_errors=True)
+        store = HistoryStore(os.path.join(tmp_dir, "historia"))
+        ctx["history"] = (store.add(df, datetime(2026, 1, 1)), store.add(later, datetime(2026, 1, 2)))
+        return len(df) + len(later)
+
+    def history_diff(ctx):
+        # Nowy obiekt - manifesty czytane z dysku, jak przy pierwszym otwarciu strony
+        store = HistoryStore(os.path.join(tmp_dir, "historia"))
+        return sum(store.diff(*ctx["history"]).summary().values())
+
+    def excel_export(ctx):
+        rows = np.arange(min(len(ctx["df"]), excel_rows))
+        to_excel_bytes(window(ctx["df"], rows, 0, len(rows)))
+        return len(rows)
+
+    return [
+        ("csv_load", csv_load),
+        ("csv_strumień_ingest", csv_stream_ingest),
+        ("normalize+typy", normalize_stage),
+        ("snapshot_zapis", snapshot_write),
+        ("snapshot_odczyt", snapshot_load),
+        ("sidebar_unique", sidebar_unique),
+        ("wybór_filtrów", selections),
+        ("filtry_łańcuch_masek", filter_chain_legacy),
+        ("filtry_indeks_budowa", filter_index_build),
+        ("filtry_indeks_zapytanie", filter_index_rows),
+        ("facety", facets),
+        ("etykiety_budowa", labels_build),
+        ("szukaj_indeks_budowa", search_build),
+        ("szukaj_zapytanie", search_query),
+        ("groupby_pełny", groupby_legacy),
+        ("kostka_budowa", cube_build),
+        ("kostka_zwinięcie", cube_rollup),
+        ("pokrycie_katalogu", catalog_coverage),
+        ("tabela_strona", table_page),
+        ("historia_zapis", history_add),
+        ("historia_diff", history_diff),
+        ("eksport_excel", excel_export),
+    ]
+
+
+def run_stage(fn, ctx, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(ctx)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def benchmark(n_rows: int, repeat: int = 3, seed: int = 0, excel_rows: int = 100_000) -> list:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "export.csv")
+        write_export(generate_export(n_rows, seed), csv_path)
+
+        results = []
+        ctx = {}
+        for name, fn in build_stages(csv_path, tmp_dir, excel_rows):
+            seconds, peak, out = run_stage(fn, ctx, repeat)
+            results.append({
+                "rows": n_rows,
+                "stage": name,
+                "seconds": round(seconds, 6),
+                "peak_mb": round(peak / 1e6, 2),
+                "output": int(out),
+            })
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--excel-rows", type=int, default=100_000, help="limit wierszy w etapie eksportu")
+    parser.add_argument("--json", help="zapisz wyniki także do pliku JSON")
+    args = parser.parse_args(argv)
+
+    all_results = []
+    for n_rows in args.rows:
+        results = benchmark(n_rows, args.repeat, args.seed, args.excel_rows)
+        all_results.extend(results)
+        print(f"\n=== {n_rows:,} wierszy ===".replace(",", " "))
+        print(f"{'etap':<26}{'czas [ms]':>12}{'szczyt [MB]':>14}{'wynik':>12}")
+        for r in results:
+            print(f"{r['stage']:<26}{r['seconds'] * 1000:>12.1f}{r['peak_mb']:>14.1f}{r['output']:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
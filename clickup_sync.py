@@ -0,0 +1,247 @@
+"""Przyrostowa synchronizacja z ClickUp zamiast ręcznego eksportu całego CSV.
+
+Pobieramy tylko zadania zmienione od ostatniej synchronizacji (``date_updated_gt``,
+stronicowanie po 100 zadań), scalamy je po ``Task ID`` z lokalnym snapshotem
+i zapisujemy snapshot Parquet, który czytają dashboardy (``data_loader``).
+
+    CLICKUP_TOKEN=... python clickup_sync.py --team-id 123456
+
+Lokalnie, na atrapie API (``mock_clickup.py``):
+
+    python clickup_sync.py --team-id 1 --base-url http://127.0.0.1:8765/api/v2
+
+Usunięte zadania nie pojawiają się w ``date_updated_gt`` - znikną dopiero
+po pełnym eksporcie / ``--full``.
+"""
+import argparse
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pandas as pd
+
+from csv_stream import EXPORT_COLUMNS
+from data_loader import (
+    FILE_PATH,
+    SEPARATOR,
+    atomic_write,
+    get_snapshot,
+    normalize,
+    snapshot_path,
+    source_view,
+    to_typed,
+    write_snapshot,
+)
+
+BASE_URL = "https://api.clickup.com/api/v2"
+STATE_PATH = "sync_state.json"
+
+# Zakładka przy kolejnym zapytaniu - zadania zmienione w tej samej milisekundzie
+# co ostatnie pobrane nie przepadną (scalanie po Task ID jest idempotentne)
+OVERLAP_MS = 1000
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Typ pola własnego ClickUp -> dopisek w nazwie kolumny eksportu
+FIELD_SUFFIXES = {
+    "drop_down": "drop down",
+    "labels": "labels",
+    "short_text": "short text",
+    "text": "text",
+}
+
+
+class ClickUpClient:
+    def __init__(self, token: str, base_url: str = BASE_URL, retries: int = 5,
+                 backoff: float = 1.0, timeout: float = 30.0):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def get(self, path: str, params: dict = None) -> dict:
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params, doseq=True)
+        request = urllib.request.Request(url, headers={"Authorization": self.token})
+
+        for attempt in range(self.retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.load(response)
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUSES or attempt == self.retries:
+                    raise
+                retry_after = e.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after else self._delay(attempt)
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == self.retries:
+                    raise
+                delay = self._delay(attempt)
+            time.sleep(delay)
+
+    def _delay(self, attempt: int) -> float:
+        # Wykładniczo + losowy rozrzut, żeby kilka procesów nie uderzało naraz
+        return self.backoff * (2 ** attempt) * (1 + random.random())
+
+    def iter_updated_tasks(self, team_id: str, since_ms: int = None):
+        page = 0
+        while True:
+            params = {
+                "page": page,
+                "order_by": "updated",
+                "reverse": "true",
+                "include_closed": "true",
+                "subtasks": "true",
+            }
+            if since_ms is not None:
+                params["date_updated_gt"] = since_ms
+            data = self.get(f"team/{team_id}/task", params)
+            tasks = data.get("tasks", [])
+            yield from tasks
+            if data.get("last_page", len(tasks) < 100) or not tasks:
+                return
+            page += 1
+
+
+def _bracketed(values) -> str:
+    return "[" + ", ".join(values) + "]"
+
+
+def _field_value(field: dict):
+    value = field.get("value")
+    if value is None or value == "":
+        return None
+    options = field.get("type_config", {}).get("options", [])
+
+    if field["type"] == "drop_down":
+        for option in options:
+            if option.get("orderindex") == value or option.get("id") == value:
+                return option.get("name")
+        return None
+    if field["type"] == "labels":
+        by_id = {option["id"]: option.get("label", option.get("name")) for option in options}
+        return _bracketed(by_id[v] for v in value if v in by_id)
+    return value
+
+
+def task_to_row(task: dict) -> dict:
+    """Zadanie z API -> wiersz w układzie kolumn eksportu CSV."""
+    row = {
+        "Task ID": task["id"],
+        "Task Name": task.get("name"),
+        "tags": _bracketed([tag["name"] for tag in task["tags"]]) if task.get("tags") else None,
+        "Lists": _bracketed([task["list"]["name"]]) if task.get("list") else None,
+    }
+    for field in task.get("custom_fields", []):
+        suffix = FIELD_SUFFIXES.get(field.get("type"))
+        if suffix:
+            row[f"{field['name']} ({suffix})"] = _field_value(field)
+    return row
+
+
+def merge_tasks(base: pd.DataFrame, tasks: list) -> pd.DataFrame:
+    """Podmienia/dopisuje zadania po ``Task ID``; kolejność kolumn jak w bazie."""
+    updates = pd.DataFrame([task_to_row(task) for task in tasks])
+    updates = updates.drop_duplicates("Task ID", keep="last")
+    updates = updates.reindex(columns=source_view(base).columns)
+    for col in updates.columns:
+        if updates[col].isna().all():
+            updates[col] = updates[col].astype(object)
+    updates = to_typed(normalize(updates))
+
+    kept = base[~base["Task ID"].isin(updates["Task ID"])]
+    if kept.empty:
+        return updates
+    # Wspólne typy przed złączeniem - inaczej puste w tej partii pole własne
+    # (kolumna z samych braków) decydowałoby o typie wyniku
+    dtypes = {col: _common_dtype(kept[col].dtype, updates[col].dtype)
+              for col in kept.columns.intersection(updates.columns)}
+    merged = pd.concat([kept.astype(dtypes), updates.astype(dtypes)], ignore_index=True)
+    # Kolejność kategorii (dysk, regał po wartości) ustawiamy ponownie
+    return to_typed(merged)
+
+
+def _common_dtype(left, right):
+    if left == right:
+        return left
+    if isinstance(left, pd.CategoricalDtype) and isinstance(right, pd.CategoricalDtype):
+        return pd.CategoricalDtype(left.categories.union(right.categories))
+    return object
+
+
+def empty_base() -> pd.DataFrame:
+    """Pusta baza w układzie kolumn eksportu - pierwsza synchronizacja bez CSV/snapshotu."""
+    return pd.DataFrame(columns=EXPORT_COLUMNS, dtype=object)
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    with atomic_write(path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def sync(client: ClickUpClient, team_id: str, csv_path: str = FILE_PATH, sep: str = SEPARATOR,
+         state_path: str = STATE_PATH, full: bool = False) -> int:
+    """Jedna synchronizacja; zwraca liczbę pobranych zadań.
+
+    Bez lokalnego CSV i snapshotu (pierwsze uruchomienie) pobieramy wszystko, jak przy ``full``.
+    """
+    state = load_state(state_path)
+    base = None
+    if not full:
+        try:
+            base = get_snapshot(csv_path, sep).df
+        except FileNotFoundError:
+            full = True
+    last_updated = None if full else state.get(str(team_id))
+    since_ms = max(last_updated - OVERLAP_MS, 0) if last_updated is not None else None
+
+    tasks = list(client.iter_updated_tasks(team_id, since_ms))
+    if not tasks:
+        return 0
+
+    if base is None:
+        base = empty_base()
+    write_snapshot(merge_tasks(base, tasks), snapshot_path(csv_path))
+
+    newest = max(int(task.get("date_updated") or 0) for task in tasks)
+    state[str(team_id)] = max(newest, last_updated or 0)
+    save_state(state, state_path)
+    return len(tasks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--team-id", required=True, help="ID workspace'u (team) w ClickUp")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--csv", default=FILE_PATH, help="lokalny eksport, obok którego leży snapshot")
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--full", action="store_true", help="pobierz wszystko od nowa")
+    parser.add_argument("--every", type=float, help="powtarzaj co N minut")
+    args = parser.parse_args(argv)
+
+    client = ClickUpClient(os.environ.get("CLICKUP_TOKEN", ""), args.base_url)
+    while True:
+        start = time.perf_counter()
+        count = sync(client, args.team_id, args.csv, state_path=args.state, full=args.full)
+        print(f"Zsynchronizowano {count} zadań w {time.perf_counter() - start:.1f} s")
+        if not args.every:
+            break
+        args.full = False
+        time.sleep(args.every * 60)
+
+
+if __name__ == "__main__":
+    main()
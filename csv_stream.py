@@ -0,0 +1,173 @@
+"""Strumieniowe czytanie eksportu ClickUp z walidacją wierszy.
+
+``pd.read_csv(on_bad_lines="skip")`` gubił złe wiersze po cichu. Tu CSV
+czytamy modułem ``csv`` (wieloliniowe ``Uwagi (text)`` w cudzysłowach są
+poprawne), porcjami po ``chunk_rows`` wierszy. Nagłówek musi mieć dokładnie
+18 kolumn eksportu; wiersz z inną liczbą pól albo bez ``Task ID`` trafia do
+pliku odrzuconych z numerem linii i powodem, a licznik powodów - do raportu.
+
+W pamięci jest naraz jedna porcja, więc wielkość pliku nie ma znaczenia
+(``ingest.py`` zapisuje porcje od razu do Parquet).
+"""
+import csv
+import io
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+EXPORT_COLUMNS = [
+    "Task ID", "Task Name", "tags", "Przeznaczenie (drop down)", "Klawiatura (labels)",
+    "Obudowa (labels)", "Procesor (drop down)", "Model Procesora (short text)",
+    "Grafika (short text)", "RAM (drop down)", "Dysk (drop down)", "Rozdzielczość (drop down)",
+    "Matryca (labels)", "Problemy (labels)", "Uwagi (text)", "Regał (drop down)", "Lists",
+    "Zamówienie (short text)",
+]
+TASK_ID = "Task ID"
+
+CHUNK_ROWS = 20_000
+# Dłuższe pole to prawie na pewno niezamknięty cudzysłów, który połknął resztę pliku
+MAX_FIELD_CHARS = 1_000_000
+REJECT_SUFFIX = ".odrzucone.csv"
+REJECT_HEADER = ["linia", "powód", "pola"]
+
+
+class SchemaError(ValueError):
+    """Nagłówek pliku nie zgadza się z kolumnami eksportu."""
+
+
+@dataclass
+class IngestReport:
+    rows_read: int = 0
+    rows_ok: int = 0
+    chunks: int = 0
+    rejected: Counter = field(default_factory=Counter)  # powód -> liczba wierszy
+
+    def reject(self, reason: str):
+        self.rows_read += 1
+        self.rejected[reason] += 1
+
+    @property
+    def rows_rejected(self) -> int:
+        return sum(self.rejected.values())
+
+    def summary(self) -> str:
+        text = f"{self.rows_ok} z {self.rows_read} wierszy poprawnych, odrzucone: {self.rows_rejected}"
+        if self.rejected:
+            text += " (" + ", ".join(f"{reason}: {n}" for reason, n in self.rejected.most_common()) + ")"
+        return text
+
+
+def reject_path(path: str) -> str:
+    return str(path).rsplit(".", 1)[0] + REJECT_SUFFIX
+
+
+def _open_text(source):
+    # Ścieżka albo bufor binarny (get_snapshot czyta plik raz, do pamięci)
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        return open(source, encoding="utf-8-sig", newline="")
+    return io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+
+
+def check_header(header: list, columns: list = EXPORT_COLUMNS):
+    missing = [c for c in columns if c not in header]
+    extra = [c for c in header if c not in columns]
+    duplicated = [c for c, n in Counter(header).items() if n > 1]
+    if missing or extra or duplicated:
+        problems = []
+        if missing:
+            problems.append("brak kolumn: " + ", ".join(missing))
+        if extra:
+            problems.append("nieznane kolumny: " + ", ".join(extra))
+        if duplicated:
+            problems.append("powtórzone kolumny: " + ", ".join(duplicated))
+        raise SchemaError("Nagłówek niezgodny z eksportem ClickUp - " + "; ".join(problems))
+
+
+class _Rejects:
+    """Plik odrzuconych wierszy - tworzony dopiero przy pierwszym złym wierszu."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, line: int, reason: str, fields: list):
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(REJECT_HEADER)
+        self._writer.writerow([line, reason, *fields])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def iter_chunks(source, sep: str = ",", chunk_rows: int = CHUNK_ROWS,
+                report: IngestReport = None, rejects_to: str = None):
+    """Porcje poprawnych wierszy: DataFrame z napisami (puste pola -> NaN), kolumny jak w eksporcie."""
+    report = report if report is not None else IngestReport()
+    rejects = _Rejects(rejects_to)
+    csv.field_size_limit(max(csv.field_size_limit(), MAX_FIELD_CHARS))
+    try:
+        with _open_text(source) as f:
+            reader = csv.reader(f, delimiter=sep)
+            header = next(reader, None)
+            if header is None:
+                raise SchemaError("Pusty plik - brak nagłówka")
+            check_header(header)
+            n_fields = len(header)
+            id_pos = header.index(TASK_ID)
+
+            rows = []
+            line = reader.line_num + 1
+            while True:
+                try:
+                    for fields in reader:
+                        if len(fields) == n_fields and fields[id_pos].strip():
+                            rows.append(fields)
+                            if len(rows) >= chunk_rows:
+                                yield _chunk(rows, header, report)
+                                rows = []
+                        elif fields:
+                            if len(fields) != n_fields:
+                                reason, detail = "zła liczba pól", f" ({len(fields)} zamiast {n_fields})"
+                            else:
+                                reason, detail = "brak Task ID", ""
+                            # Linia, w której zaczyna się rekord (wieloliniowe pola zajmują kilka)
+                            report.reject(reason)
+                            rejects.write(line, reason + detail, fields)
+                        line = reader.line_num + 1
+                    break
+                except csv.Error as e:
+                    report.reject("błąd CSV")
+                    rejects.write(line, f"błąd CSV: {e}", [])
+                    if reader.line_num + 1 == line:
+                        break  # czytnik nie ruszył dalej - koniec pliku
+                    line = reader.line_num + 1
+            if rows:
+                yield _chunk(rows, header, report)
+    finally:
+        rejects.close()
+
+
+def _chunk(rows: list, header: list, report: IngestReport) -> pd.DataFrame:
+    report.rows_read += len(rows)
+    report.rows_ok += len(rows)
+    report.chunks += 1
+    values = np.array(rows, dtype=object)
+    # Puste pole -> NaN, jak w pd.read_csv
+    values[values == ""] = np.nan
+    return pd.DataFrame(values, columns=header)[EXPORT_COLUMNS]
+
+
+def read_rows(source, sep: str = ",", report: IngestReport = None, rejects_to: str = None) -> pd.DataFrame:
+    """Cały plik jako jedna ramka napisów (dla małych eksportów i stron Streamlit)."""
+    chunks = list(iter_chunks(source, sep, report=report, rejects_to=rejects_to))
+    if not chunks:
+        return pd.DataFrame(columns=EXPORT_COLUMNS, dtype=object)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
@@ -0,0 +1,299 @@
+"""Wspólne wczytywanie eksportu ClickUp dla wszystkich stron magazynu.
+
+Plik jest parsowany raz na proces. Przy każdym wywołaniu sprawdzamy tylko
+``os.stat`` (mtime + rozmiar); dopiero gdy się zmieni, liczymy skrót zawartości
+i - jeśli dane faktycznie są inne - parsujemy plik ponownie.
+
+Jeśli obok CSV leży aktualny snapshot Parquet (``python ingest.py``), czytamy
+go zamiast CSV - kolumny są już otypowane (kategorie, liczby całkowite)
+i znormalizowane.
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from csv_stream import IngestReport, read_rows
+from specs import SPEC_CATEGORY_COLUMNS, SPEC_COLUMNS, add_specs
+
+FILE_PATH = "nazwa_pliku.csv"
+SEPARATOR = ","
+
+CPU_MODEL_COL = "Model Procesora (short text)"
+
+# Kolumny dopisywane przy wczytaniu (nie ma ich w eksporcie z ClickUp)
+DERIVED_COLUMNS = ["Model_Glowny"] + SPEC_COLUMNS
+
+# Kolumny o małej liczbie różnych wartości - trzymamy jako category
+CATEGORY_COLUMNS = [
+    "tags",
+    "Przeznaczenie (drop down)",
+    "Klawiatura (labels)",
+    "Obudowa (labels)",
+    "Procesor (drop down)",
+    "Model Procesora (short text)",
+    "Grafika (short text)",
+    "Rozdzielczość (drop down)",
+    "Matryca (labels)",
+    "Problemy (labels)",
+    "Lists",
+    "Model_Glowny",
+    *SPEC_CATEGORY_COLUMNS,
+]
+
+# Kolumny liczbowe (GB); "Brak" -> 0
+INT_COLUMNS = ["RAM (drop down)"]
+INT_VALUE_PATTERN = r"\d+"
+NO_VALUE_WORDS = ["brak", "nie", "-"]
+# Kategorie z liczbami, posortowane po wartości, nie alfabetycznie. Dysku nie
+# sumujemy: "1000 + 1000" (dwa dyski) to inna konfiguracja niż "2000";
+# regał to miejsce, nie ilość
+NUMBERED_CATEGORY_COLUMNS = ["Dysk (drop down)", "Regał (drop down)"]
+
+# Podbijamy przy każdej zmianie normalize()/to_typed() - starsze snapshoty
+# są wtedy ignorowane i dane czytamy z CSV
+SNAPSHOT_FORMAT = "4"
+SNAPSHOT_SUFFIX = ".parquet"
+# Liczba wierszy odrzuconych przy imporcie (stopka snapshotu)
+REJECTED_KEY = b"magazyn_odrzucone"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Snapshot:
+    """Wczytane dane + wersja (skrót zawartości pliku).
+
+    ``df`` jest współdzielony przez wszystkie sesje - traktujemy go jako
+    tylko do odczytu.
+    """
+
+    df: pd.DataFrame
+    version: str
+    path: str
+    rejected: int = 0  # wiersze eksportu odrzucone przy wczytaniu (csv_stream)
+    _derived: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def derived(self, name, builder):
+        """Zwraca obiekt pochodny (indeks, agregaty) liczony raz na snapshot."""
+        if name not in self._derived:
+            with self._lock:
+                if name not in self._derived:
+                    self._derived[name] = builder(self.df)
+        return self._derived[name]
+
+
+_cache = {}
+_format_cache = {}
+_cache_lock = threading.Lock()
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    # Normalizacja modelu procesora dla spójności
+    if CPU_MODEL_COL in df.columns:
+        df[CPU_MODEL_COL] = df[CPU_MODEL_COL].str.lower().str.strip()
+
+    # Producent / model główny z tags (pierwsze słowo)
+    if "tags" in df.columns:
+        df["Model_Glowny"] = (
+            df["tags"]
+            .astype(str)
+            .str.split()
+            .str[0]
+            .str.strip()
+        )
+
+    # CPU/GPU rozłożone na producenta, generację, rodzinę i kanoniczny klucz
+    return add_specs(df)
+
+
+def _parse_int_values(values: pd.Index) -> pd.Series:
+    """``"N"`` -> N, ``"Brak"`` -> 0; inne zapisy ("12.5", "1TB", "8 + 8") -> <NA>."""
+    text = pd.Series(values.astype(str), dtype=object).str.strip()
+    parsed = pd.to_numeric(text.where(text.str.fullmatch(INT_VALUE_PATTERN))).astype("Int64")
+    parsed[text.str.lower().isin(NO_VALUE_WORDS)] = 0
+    return parsed
+
+
+def to_int_column(series: pd.Series) -> pd.Series:
+    # Parsujemy tylko unikalne wartości (kilkanaście), potem rozkładamy po kodach
+    cat = series.astype("category")
+    parsed = _parse_int_values(cat.cat.categories)
+    unparsed = cat.cat.categories[parsed.isna().to_numpy()]
+    if len(unparsed):
+        # Nowa opcja listy rozwijanej w ClickUp - lepiej brak niż zmyślona liczba
+        logger.warning("%s: nierozpoznane wartości %s -> brak", series.name, ", ".join(map(repr, unparsed)))
+    # kod -1 (brak wartości) -> <NA>
+    result = parsed.array.take(cat.cat.codes.to_numpy(), allow_fill=True)
+    return pd.Series(result, index=series.index, name=series.name).astype("Int32")
+
+
+def _number_key(value: str) -> tuple:
+    # "BRAK" < "128" < ... < "1000" < "2000" < "1000 + 1000"
+    numbers = [int(n) for n in re.findall(r"\d+", value)]
+    return sum(numbers), len(numbers), value
+
+
+def to_numbered_category(series: pd.Series) -> pd.Series:
+    """Kategoria z zapisem z ClickUp bez zmian, kategorie posortowane po wartości liczb."""
+    if pd.api.types.is_numeric_dtype(series):
+        series = series.round().astype("Int64")
+    cat = series.astype(str).where(series.notna()).astype("category")
+    return cat.cat.reorder_categories(sorted(cat.cat.categories, key=_number_key))
+
+
+def to_typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Kategorie dla drop downów/etykiet (dysk i regał po wartości), Int32 dla RAM."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].round().astype("Int32")
+            else:
+                df[col] = to_int_column(df[col])
+    for col in NUMBERED_CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = to_numbered_category(df[col])
+    return df
+
+
+def read_export(path: str = FILE_PATH, sep: str = SEPARATOR, report: IngestReport = None,
+                rejects_to: str = None) -> pd.DataFrame:
+    """Surowy eksport ClickUp -> otypowany, znormalizowany DataFrame.
+
+    Złe wiersze nie znikają po cichu: liczniki trafiają do ``report``,
+    a same wiersze (z numerami linii) do pliku ``rejects_to``.
+    """
+    df = read_rows(path, sep, report=report, rejects_to=rejects_to)
+    return to_typed(normalize(df))
+
+
+def snapshot_path(path: str = FILE_PATH) -> str:
+    return os.path.splitext(path)[0] + SNAPSHOT_SUFFIX
+
+
+@contextmanager
+def atomic_write(out_path: str):
+    """``with atomic_write(path) as tmp_path: ...`` - zapis do pliku tymczasowego,
+    podmiana jednym ``os.replace``; działające dashboardy nie zobaczą połowy pliku,
+    a po błędzie zostaje poprzednia wersja."""
+    tmp_path = out_path + ".tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_snapshot(df: pd.DataFrame, out_path: str, metadata: dict = None):
+    """Parquet (zstd) z wersją formatu i opcjonalnymi dodatkowymi metadanymi."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[b"magazyn_format"] = SNAPSHOT_FORMAT.encode()
+    for key, value in (metadata or {}).items():
+        schema_metadata[key.encode()] = str(value).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+    with atomic_write(out_path) as tmp_path:
+        pq.write_table(table, tmp_path, compression="zstd")
+
+
+def read_snapshot(source) -> pd.DataFrame:
+    return pq.read_table(source).to_pandas()
+
+
+def _read_snapshot_with_rejects(source):
+    # Licznik odrzuconych jest w stopce pliku (ingest.py dopisuje go po ostatniej porcji)
+    parquet_file = pq.ParquetFile(source)
+    return parquet_file.read().to_pandas(), int((parquet_file.metadata.metadata or {}).get(REJECTED_KEY, 0))
+
+
+def _signature(path: str):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def _snapshot_format(snap_path: str, signature) -> str:
+    # Stopkę Parquet czytamy tylko raz na wersję pliku
+    cached = _format_cache.get(snap_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        metadata = pq.read_schema(snap_path).metadata or {}
+    except (pa.ArrowInvalid, OSError):
+        metadata = {}
+    fmt = metadata.get(b"magazyn_format", b"").decode()
+    _format_cache[snap_path] = (signature, fmt)
+    return fmt
+
+
+def _snapshot_is_fresh(snap_path: str, csv_path: str) -> bool:
+    if not os.path.exists(snap_path):
+        return False
+    snap_signature = _signature(snap_path)
+    if _snapshot_format(snap_path, snap_signature) != SNAPSHOT_FORMAT:
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return snap_signature[1] >= os.stat(csv_path).st_mtime_ns
+
+
+def source_columns(df: pd.DataFrame) -> list:
+    """Same kolumny z eksportu, bez kolumn dopisanych przy wczytaniu."""
+    return [c for c in df.columns if c not in DERIVED_COLUMNS]
+
+
+def source_view(df: pd.DataFrame) -> pd.DataFrame:
+    return df[source_columns(df)]
+
+
+def get_snapshot(path: str = FILE_PATH, sep: str = SEPARATOR) -> Snapshot:
+    key = (os.path.abspath(path), sep)
+    snap_path = snapshot_path(path)
+    source = snap_path if _snapshot_is_fresh(snap_path, path) else path
+    signature = _signature(source)
+
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        with open(source, "rb") as f:
+            raw = f.read()
+        version = hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+        # mtime się zmienił, ale zawartość nie (np. ponowne skopiowanie pliku)
+        if entry is not None and entry[1].version == version:
+            snapshot = entry[1]
+        elif source == snap_path:
+            df, rejected = _read_snapshot_with_rejects(pa.BufferReader(raw))
+            snapshot = Snapshot(df, version, source, rejected)
+        else:
+            report = IngestReport()
+            snapshot = Snapshot(read_export(io.BytesIO(raw), sep, report), version, source, report.rows_rejected)
+            if report.rows_rejected:
+                logger.warning("%s: %s (python ingest.py zapisze je do pliku)", path, report.summary())
+
+        _cache[key] = (signature, snapshot)
+        return snapshot
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _format_cache.clear()
@@ -0,0 +1,88 @@
+"""Eksport danych do pamięci (BytesIO) - bez plików tymczasowych w katalogu roboczym.
+
+Excel piszemy bezpośrednio przez xlsxwriter w trybie ``constant_memory``:
+wiersz po wierszu, w paczkach, więc pamięć nie rośnie z rozmiarem arkusza.
+"""
+import hashlib
+import io
+import json
+from collections import namedtuple
+
+import pandas as pd
+import xlsxwriter
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Limit wierszy arkusza Excel (bez nagłówka)
+EXCEL_MAX_ROWS = 1_048_575
+
+# Ile wierszy naraz zamieniamy na obiekty Pythona przy zapisie
+CHUNK_ROWS = 10_000
+
+ExportFormat = namedtuple("ExportFormat", ["extension", "mime", "writer"])
+
+
+def write_sheet(workbook, sheet_name: str, df: pd.DataFrame):
+    worksheet = workbook.add_worksheet(sheet_name[:31])
+    header_format = workbook.add_format({"bold": True, "border": 1})
+    worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+
+    row_num = 1
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            worksheet.write_row(row_num, 0, row)
+            row_num += 1
+    return worksheet
+
+
+def write_excel(target, sheets, sheet_name: str = "Sheet1"):
+    """DataFrame albo ``{nazwa arkusza: DataFrame}`` -> xlsx w pliku (ścieżka) albo buforze."""
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {sheet_name: sheets}
+
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    for name, df in sheets.items():
+        write_sheet(workbook, name, df)
+    workbook.close()
+
+
+def to_excel_bytes(sheets, sheet_name: str = "Sheet1") -> bytes:
+    """DataFrame albo ``{nazwa arkusza: DataFrame}`` -> zawartość pliku xlsx."""
+    buffer = io.BytesIO()
+    write_excel(buffer, sheets, sheet_name)
+    return buffer.getvalue()
+
+
+def to_csv_bytes(df: pd.DataFrame, sheet_name: str = None) -> bytes:
+    # utf-8-sig, żeby Excel poprawnie pokazał polskie znaki
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def to_parquet_bytes(df: pd.DataFrame, sheet_name: str = None) -> bytes:
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "Excel": ExportFormat("xlsx", EXCEL_MIME, to_excel_bytes),
+    "CSV": ExportFormat("csv", "text/csv", to_csv_bytes),
+    "Parquet": ExportFormat("parquet", "application/octet-stream", to_parquet_bytes),
+}
+
+
+def available_formats(n_rows: int) -> list:
+    """Excel tylko gdy dane mieszczą się w jednym arkuszu."""
+    return [name for name in EXPORT_FORMATS if name != "Excel" or n_rows <= EXCEL_MAX_ROWS]
+
+
+def export_bytes(df: pd.DataFrame, fmt: str, sheet_name: str = "Sheet1") -> bytes:
+    return EXPORT_FORMATS[fmt].writer(df, sheet_name=sheet_name)
+
+
+def filter_state_key(state: dict) -> str:
+    """Stabilny skrót stanu filtrów (kolejność kluczy bez znaczenia)."""
+    payload = json.dumps(state, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
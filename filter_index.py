@@ -0,0 +1,161 @@
+"""Indeks filtrów sidebaru: dla każdej kolumny bitmapa wartość -> wiersze.
+
+Indeks budujemy raz na snapshot danych (``Snapshot.derived``). Dowolną
+kombinację filtrów liczymy jako AND spakowanych bitmap, a DataFrame kroimy
+tylko raz, na samym końcu.
+"""
+import numpy as np
+import pandas as pd
+
+ALL = "Wszystkie"
+
+# Parametr URL -> kolumna w danych (ta sama kolejność co w sidebarze)
+FILTER_COLUMNS = {
+    "tag": "tags",
+    "processor": "Procesor (drop down)",
+    "processor_model": "Model Procesora (short text)",
+    "resolution": "Rozdzielczość (drop down)",
+    "destinations": "Przeznaczenie (drop down)",
+    "list": "Lists",
+}
+
+# Filtry wielokrotnego wyboru (w URL parametr powtórzony: ?destinations=a&destinations=b)
+MULTI_FILTERS = {"destinations"}
+
+# Kod wiersza z brakiem wartości (pd.factorize)
+NA_CODE = -1
+
+
+def _is_na(value) -> bool:
+    return not isinstance(value, (list, tuple, set)) and pd.isna(value)
+
+
+def normalize_tag(value: str) -> str:
+    """``"Dell Precision 5540"`` -> ``"[dell precision 5540]"`` (zapis tagów w eksporcie)."""
+    return "[" + value.lower().strip().strip("[]").strip() + "]"
+
+
+def filters_from_params(query_params: dict) -> dict:
+    """Parametry URL (``{nazwa: [wartości]}``) -> ``{parametr: wartość}``; brak = ``ALL``."""
+    filters = {}
+    for name in FILTER_COLUMNS:
+        values = query_params.get(name, [] if name in MULTI_FILTERS else [ALL])
+        filters[name] = list(values) if name in MULTI_FILTERS else values[0]
+    if filters["processor_model"] != ALL:
+        filters["processor_model"] = filters["processor_model"].lower().strip()
+    if filters["tag"] != ALL:
+        filters["tag"] = normalize_tag(filters["tag"])
+    return filters
+
+
+def selections_from_params(params: dict) -> dict:
+    """``{"tag": ..., "destinations": [...]}`` -> ``{kolumna: wybór}``."""
+    return {FILTER_COLUMNS[name]: value for name, value in params.items() if name in FILTER_COLUMNS}
+
+
+class FilterIndex:
+    def __init__(self, df: pd.DataFrame, columns=None):
+        self.n_rows = len(df)
+        self.columns = list(columns or FILTER_COLUMNS.values())
+        self._codes = {}
+        self._values = {}
+        self._lookup = {}
+        for col in self.columns:
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+            values = list(uniques)
+            self._codes[col] = codes.astype(np.int32)
+            self._values[col] = values
+            self._lookup[col] = {value: code for code, value in enumerate(values)}
+
+        # Bitmapy pojedynczych wartości liczymy leniwie, przy pierwszym użyciu
+        self._bitmaps = {}
+        self._full = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._empty = np.zeros_like(self._full)
+
+    def _code(self, col, value) -> int:
+        if _is_na(value):
+            return NA_CODE
+        return self._lookup[col].get(value)
+
+    def _code_bitmap(self, col, code) -> np.ndarray:
+        key = (col, code)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = np.packbits(self._codes[col] == code)
+            self._bitmaps[key] = bitmap
+        return bitmap
+
+    def bitmap(self, col, selection) -> np.ndarray:
+        """Spakowana bitmapa wierszy pasujących do wyboru w jednej kolumnie.
+
+        ``ALL``/``None``/pusta lista -> wszystkie wiersze, lista -> OR wartości,
+        NaN -> wiersze bez wartości (jak ``isna()``).
+        """
+        if selection is None or (isinstance(selection, str) and selection == ALL):
+            return self._full
+        if isinstance(selection, (list, tuple, set)):
+            if not selection:
+                return self._full
+            result = self._empty.copy()
+            for value in selection:
+                code = self._code(col, value)
+                if code is not None:
+                    np.bitwise_or(result, self._code_bitmap(col, code), out=result)
+            return result
+        code = self._code(col, selection)
+        if code is None:
+            return self._empty
+        return self._code_bitmap(col, code)
+
+    def _base(self, extra) -> np.ndarray:
+        # extra: dodatkowa maska wierszy (bool) spoza indeksu, np. filtr etykiet
+        return self._full if extra is None else np.packbits(extra)
+
+    def mask(self, selections: dict, extra=None) -> np.ndarray:
+        result = self._base(extra).copy()
+        for col, selection in selections.items():
+            np.bitwise_and(result, self.bitmap(col, selection), out=result)
+        return result
+
+    def rows(self, selections: dict, extra=None) -> np.ndarray:
+        """Pozycje (iloc) wierszy spełniających wszystkie filtry."""
+        bits = np.unpackbits(self.mask(selections, extra), count=self.n_rows)
+        return np.flatnonzero(bits)
+
+    def select(self, df: pd.DataFrame, selections: dict, columns=None, extra=None) -> pd.DataFrame:
+        rows = self.rows(selections, extra)
+        if columns is None:
+            return df.take(rows)
+        return df.iloc[rows, df.columns.get_indexer(columns)]
+
+    def facets(self, selections: dict, extra=None) -> dict:
+        """Dla każdej kolumny: wartości osiągalne przy pozostałych filtrach + liczba wierszy.
+
+        Maska "wszystkie filtry poza kolumną i" to AND prefiksu i sufiksu bitmap,
+        więc wszystkie facety liczymy w jednym przebiegu (bincount po kodach),
+        bez osobnego groupby dla każdego widgetu.
+        """
+        masks = [self.bitmap(col, selections.get(col)) for col in self.columns]
+
+        prefix = [self._base(extra)]
+        for m in masks[:-1]:
+            prefix.append(prefix[-1] & m)
+        suffix = [self._full]
+        for m in reversed(masks[1:]):
+            suffix.append(suffix[-1] & m)
+        suffix.reverse()
+
+        result = {}
+        for i, col in enumerate(self.columns):
+            others = np.unpackbits(prefix[i] & suffix[i], count=self.n_rows).view(bool)
+            values = self._values[col]
+            # +1: kod -1 (brak wartości) ląduje w koszyku 0
+            counts = np.bincount(self._codes[col][others] + 1, minlength=len(values) + 1)
+            facet = [(values[code], int(counts[code + 1])) for code in np.flatnonzero(counts[1:])]
+            if counts[0]:
+                facet.append((np.nan, int(counts[0])))
+            result[col] = facet
+        return result
+
+    def is_known(self, col, value) -> bool:
+        return _is_na(value) or value in self._lookup[col]
@@ -0,0 +1,10 @@
+"""Strona „Historia magazynu” jako osobna aplikacja.
+
+Wszystkie widoki naraz, na jednej kopii danych: ``streamlit run magazyn.py``.
+"""
+import streamlit as st
+
+from page_history import render
+
+st.set_page_config(layout="wide")
+render()
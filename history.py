@@ -0,0 +1,247 @@
+"""Historia stanów magazynu: każdy import jako skompresowany snapshot + szybki diff.
+
+Układ katalogu (domyślnie ``historia/``):
+
+    manifests/<id>.parquet   Task ID, skrót wiersza, plik z treścią wiersza,
+                             Regał, Przeznaczenie (kilka MB na 100k pozycji)
+    rows/<id>.parquet        pełne wiersze - tylko te, których nie było
+                             w poprzednim imporcie (deduplikacja po skrócie)
+
+Diff dwóch importów czyta wyłącznie dwa manifesty: złączenie po ``Task ID``
+i porównanie 64-bitowych skrótów, bez wczytywania pełnych danych.
+
+    python history.py add nazwa_pliku.csv [--date 2026-05-29]
+    python history.py list
+    python history.py diff 20260528T080000 20260529T080000
+"""
+import argparse
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from csv_stream import IngestReport
+from data_loader import FILE_PATH, SEPARATOR, read_export, source_view, to_typed, write_snapshot
+
+HISTORY_DIR = "historia"
+ID_FORMAT = "%Y%m%dT%H%M%S"
+
+TASK_ID = "Task ID"
+SHELF_COL = "Regał (drop down)"
+DESTINATION_COL = "Przeznaczenie (drop down)"
+HASH_COL = "row_hash"
+CHUNK_COL = "chunk"
+
+
+@dataclass
+class SnapshotDiff:
+    """Zmiany między dwoma importami (ramki z ``Task ID`` i wartościami przed/po)."""
+
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    moved: pd.DataFrame
+    destination_changed: pd.DataFrame
+    changed: pd.DataFrame
+
+    def summary(self) -> dict:
+        return {
+            "Nowe": len(self.added),
+            "Usunięte": len(self.removed),
+            "Przeniesione (regał)": len(self.moved),
+            "Zmiana przeznaczenia": len(self.destination_changed),
+            "Inne zmiany": len(self.changed),
+        }
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bitowy skrót każdego wiersza (tylko kolumny z eksportu)."""
+    return pd.util.hash_pandas_object(source_view(df), index=False).to_numpy()
+
+
+def _differs(before: pd.Series, after: pd.Series) -> np.ndarray:
+    # Porównanie z uwzględnieniem braków (brak == brak); jako tekst, bo starsze
+    # manifesty mają regał jako liczbę, nowsze jako kategorię
+    before = before.astype("string").to_numpy(dtype=object, na_value="\0")
+    after = after.astype("string").to_numpy(dtype=object, na_value="\0")
+    return before != after
+
+
+class HistoryStore:
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+        self.manifest_dir = os.path.join(root, "manifests")
+        self.rows_dir = os.path.join(root, "rows")
+        self._manifests = {}
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.manifest_dir, snapshot_id + ".parquet")
+
+    def _rows_path(self, chunk: str) -> str:
+        return os.path.join(self.rows_dir, chunk + ".parquet")
+
+    def snapshots(self) -> pd.DataFrame:
+        """Lista importów (tylko stopki manifestów, bez czytania danych)."""
+        records = []
+        if os.path.isdir(self.manifest_dir):
+            for name in sorted(os.listdir(self.manifest_dir)):
+                if not name.endswith(".parquet"):
+                    continue
+                meta = pq.read_metadata(os.path.join(self.manifest_dir, name))
+                extra = {k.decode(): v.decode() for k, v in (meta.metadata or {}).items()
+                         if k.startswith(b"historia_")}
+                records.append({
+                    "id": name[:-len(".parquet")],
+                    "data": pd.Timestamp(extra.get("historia_data")),
+                    "wiersze": meta.num_rows,
+                    "nowe_wiersze": int(extra.get("historia_nowe_wiersze", 0)),
+                    "wersja": extra.get("historia_wersja"),
+                    "źródło": extra.get("historia_zrodlo"),
+                })
+        return pd.DataFrame(records, columns=["id", "data", "wiersze", "nowe_wiersze", "wersja", "źródło"])
+
+    def manifest(self, snapshot_id: str) -> pd.DataFrame:
+        # Manifesty się nie zmieniają - trzymamy je w pamięci po pierwszym odczycie
+        manifest = self._manifests.get(snapshot_id)
+        if manifest is None:
+            manifest = pq.read_table(self._manifest_path(snapshot_id)).to_pandas()
+            self._manifests[snapshot_id] = manifest
+        return manifest
+
+    def add(self, df: pd.DataFrame, imported_at: datetime = None, source: str = "") -> str:
+        """Zapisuje import; zwraca jego id (albo id ostatniego, jeśli dane się nie zmieniły)."""
+        imported_at = imported_at or datetime.now()
+        snapshot_id = imported_at.strftime(ID_FORMAT)
+
+        df = source_view(df).drop_duplicates(TASK_ID, keep="last").reset_index(drop=True)
+        hashes = row_hashes(df)
+        version = hashlib.blake2b(np.sort(hashes).tobytes(), digest_size=16).hexdigest()
+
+        # Deduplikacja względem poprzedniego importu: niezmienione wiersze
+        # wskazują na plik, w którym już leżą
+        existing = self.snapshots()
+        previous = existing[existing["id"] <= snapshot_id].tail(1)
+        if len(previous) and previous["wersja"].iloc[0] == version:
+            return previous["id"].iloc[0]
+        if snapshot_id in existing["id"].values:
+            raise ValueError(f"Import {snapshot_id} już istnieje w historii")
+        chunks = np.full(len(df), snapshot_id, dtype=object)
+        if len(previous):
+            prev = self.manifest(previous["id"].iloc[0])
+            positions = pd.Index(prev[HASH_COL]).get_indexer(hashes)
+            known = positions >= 0
+            chunks[known] = prev[CHUNK_COL].to_numpy(dtype=object)[positions[known]]
+        new_rows = chunks == snapshot_id
+
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        os.makedirs(self.rows_dir, exist_ok=True)
+        if new_rows.any():
+            write_snapshot(df[new_rows].assign(**{HASH_COL: hashes[new_rows]}), self._rows_path(snapshot_id))
+
+        manifest = pd.DataFrame({
+            TASK_ID: df[TASK_ID].astype(str).to_numpy(),
+            HASH_COL: hashes,
+            CHUNK_COL: pd.Categorical(chunks),
+            SHELF_COL: df[SHELF_COL] if SHELF_COL in df.columns else pd.NA,
+            DESTINATION_COL: df[DESTINATION_COL] if DESTINATION_COL in df.columns else pd.NA,
+        })
+        write_snapshot(manifest, self._manifest_path(snapshot_id), metadata={
+            "historia_data": imported_at.isoformat(),
+            "historia_wersja": version,
+            "historia_nowe_wiersze": int(new_rows.sum()),
+            "historia_zrodlo": source,
+        })
+        return snapshot_id
+
+    def load(self, snapshot_id: str, task_ids=None, columns=None) -> pd.DataFrame:
+        """Pełne wiersze importu (opcjonalnie tylko wybrane zadania / kolumny)."""
+        manifest = self.manifest(snapshot_id)
+        if task_ids is not None:
+            manifest = manifest[manifest[TASK_ID].isin(list(task_ids))]
+        read_columns = None if columns is None else list(dict.fromkeys([HASH_COL, TASK_ID, *columns]))
+
+        parts = []
+        for chunk, group in manifest.groupby(CHUNK_COL, observed=True):
+            table = pq.read_table(self._rows_path(chunk), columns=read_columns)
+            table = table.filter(pc.is_in(table[HASH_COL], value_set=pa.array(group[HASH_COL].to_numpy(), pa.uint64())))
+            parts.append(table.to_pandas())
+        if not parts:
+            return pd.DataFrame(columns=read_columns or [TASK_ID]).drop(columns=HASH_COL, errors="ignore")
+
+        rows = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        # Kolejność jak w imporcie
+        rows = rows.set_index(HASH_COL).loc[manifest[HASH_COL]].reset_index(drop=True)
+        return to_typed(rows)
+
+    def diff(self, old_id: str, new_id: str) -> SnapshotDiff:
+        old = self.manifest(old_id)
+        new = self.manifest(new_id)
+
+        positions = pd.Index(old[TASK_ID]).get_indexer(new[TASK_ID])
+        matched = positions >= 0
+        before = old.iloc[positions[matched]].reset_index(drop=True)
+        after = new[matched].reset_index(drop=True)
+        in_new = np.zeros(len(old), dtype=bool)
+        in_new[positions[matched]] = True
+
+        # Tylko wiersze z innym skrótem mogą mieć zmienione pola
+        changed = before[HASH_COL].to_numpy() != after[HASH_COL].to_numpy()
+        before, after = before[changed].reset_index(drop=True), after[changed].reset_index(drop=True)
+        moved = _differs(before[SHELF_COL], after[SHELF_COL])
+        destination = _differs(before[DESTINATION_COL], after[DESTINATION_COL])
+
+        def before_after(mask, col):
+            return pd.DataFrame({
+                TASK_ID: after[TASK_ID][mask].to_numpy(),
+                "przed": before[col][mask].to_numpy(),
+                "po": after[col][mask].to_numpy(),
+            })
+
+        return SnapshotDiff(
+            added=new.loc[~matched, [TASK_ID, SHELF_COL, DESTINATION_COL]].reset_index(drop=True),
+            removed=old.loc[~in_new, [TASK_ID, SHELF_COL, DESTINATION_COL]].reset_index(drop=True),
+            moved=before_after(moved, SHELF_COL),
+            destination_changed=before_after(destination, DESTINATION_COL),
+            changed=after.loc[~moved & ~destination, [TASK_ID]].reset_index(drop=True),
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=HISTORY_DIR, help="katalog historii")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="dopisz import do historii")
+    add.add_argument("csv", nargs="?", default=FILE_PATH)
+    add.add_argument("--sep", default=SEPARATOR)
+    add.add_argument("--date", help="data importu (domyślnie teraz), np. 2026-05-29 lub 2026-05-29T08:00")
+
+    commands.add_parser("list", help="lista importów")
+
+    diff = commands.add_parser("diff", help="zmiany między dwoma importami")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.root)
+    if args.command == "add":
+        imported_at = datetime.fromisoformat(args.date) if args.date else None
+        report = IngestReport()
+        snapshot_id = store.add(read_export(args.csv, args.sep, report), imported_at, source=os.path.basename(args.csv))
+        if report.rows_rejected:
+            print(report.summary())
+        print(store.snapshots().set_index("id").loc[snapshot_id].to_string())
+    elif args.command == "list":
+        print(store.snapshots().to_string(index=False))
+    else:
+        for name, count in store.diff(args.old, args.new).summary().items():
+            print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
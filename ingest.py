@@ -0,0 +1,120 @@
+"""Konwersja eksportu ClickUp (CSV) do otypowanego snapshotu Parquet.
+
+Uruchamiamy po każdym nowym eksporcie:
+
+    python ingest.py nazwa_pliku.csv
+
+Plik czytamy strumieniowo (``csv_stream``): porcja po porcji jest
+walidowana, normalizowana i dopisywana do Parquet, więc pamięć nie rośnie
+z wielkością eksportu. Złe wiersze lądują w ``nazwa_pliku.odrzucone.csv``
+(numer linii, powód, pola), a liczniki są w podsumowaniu.
+
+Dashboardy same wykryją świeży snapshot obok CSV i przestaną parsować CSV.
+Z ``--historia`` import trafia też do historii stanów (``history.py``).
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from csv_stream import CHUNK_ROWS, IngestReport, SchemaError, iter_chunks, reject_path
+from data_loader import (
+    FILE_PATH,
+    REJECTED_KEY,
+    SEPARATOR,
+    SNAPSHOT_FORMAT,
+    atomic_write,
+    normalize,
+    read_snapshot,
+    snapshot_path,
+    to_typed,
+)
+from history import HISTORY_DIR, HistoryStore
+
+
+def _arrow_schema(df: pd.DataFrame) -> pa.Schema:
+    """Schemat wspólny dla wszystkich porcji (kategorie porcji mają różne słowniki)."""
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = []
+    for arrow_field in inferred:
+        dtype = df[arrow_field.name].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif pd.api.types.is_object_dtype(dtype):
+            # Porcja z samymi brakami nie może zmienić typu kolumny tekstowej
+            arrow_type = pa.string()
+        else:
+            arrow_type = arrow_field.type
+        fields.append(pa.field(arrow_field.name, arrow_type))
+    return pa.schema(fields, metadata=inferred.metadata)
+
+
+def stream_to_snapshot(csv_path: str, out_path: str, sep: str = SEPARATOR, chunk_rows: int = CHUNK_ROWS,
+                       rejects_to: str = None) -> IngestReport:
+    """CSV -> snapshot Parquet porcjami (w pamięci jedna porcja naraz)."""
+    report = IngestReport()
+    with atomic_write(out_path) as tmp_path:
+        writer = None
+        try:
+            for chunk in iter_chunks(csv_path, sep, chunk_rows, report, rejects_to):
+                typed = to_typed(normalize(chunk))
+                if writer is None:
+                    schema = _arrow_schema(typed)
+                    schema = schema.with_metadata({**schema.metadata, b"magazyn_format": SNAPSHOT_FORMAT.encode()})
+                    writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+                writer.write_table(pa.Table.from_pandas(typed, schema=schema, preserve_index=False))
+            if writer is None:
+                raise SchemaError(f"Brak poprawnych wierszy w {csv_path}")
+            # Liczba odrzuconych znana dopiero na końcu - trafia do stopki pliku
+            writer.add_key_value_metadata({REJECTED_KEY.decode(): str(report.rows_rejected)})
+        finally:
+            if writer is not None:
+                writer.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=FILE_PATH, help="plik eksportu z ClickUp")
+    parser.add_argument("--sep", default=SEPARATOR)
+    parser.add_argument("-o", "--output", help="ścieżka snapshotu (domyślnie obok CSV)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="wierszy w porcji")
+    parser.add_argument("--odrzucone", metavar="PLIK",
+                        help="plik odrzuconych wierszy (domyślnie <csv>.odrzucone.csv)")
+    parser.add_argument("--historia", nargs="?", const=HISTORY_DIR, metavar="KATALOG",
+                        help=f"dopisz import do historii stanów (domyślnie {HISTORY_DIR}/)")
+    args = parser.parse_args(argv)
+
+    out_path = args.output or snapshot_path(args.csv)
+    rejects_to = args.odrzucone or reject_path(args.csv)
+    if os.path.exists(rejects_to):
+        # Raport z poprzedniego importu nie może udawać bieżącego
+        os.remove(rejects_to)
+
+    start = time.perf_counter()
+    try:
+        report = stream_to_snapshot(args.csv, out_path, args.sep, args.chunk_rows, rejects_to)
+    except SchemaError as e:
+        sys.exit(f"Błąd: {e}")
+    elapsed = time.perf_counter() - start
+
+    csv_mb = os.path.getsize(args.csv) / 1e6
+    out_mb = os.path.getsize(out_path) / 1e6
+    print(f"{report.rows_ok} wierszy: {args.csv} ({csv_mb:.1f} MB) -> {out_path} ({out_mb:.1f} MB), "
+          f"{report.chunks} porcji, {elapsed:.2f} s")
+    print(report.summary())
+    if report.rows_rejected:
+        print(f"Odrzucone wiersze: {rejects_to}")
+
+    if args.historia:
+        # Historia potrzebuje całego importu naraz - czytamy gotowy snapshot
+        snapshot_id = HistoryStore(args.historia).add(read_snapshot(out_path), source=os.path.basename(args.csv))
+        print(f"Historia: import {snapshot_id} w {args.historia}/")
+
+
+if __name__ == "__main__":
+    main()
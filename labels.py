@@ -0,0 +1,111 @@
+"""Dekodowanie kolumn etykiet ClickUp (``"[Pionowy Enter ISO / EU, Brytyjska]"``).
+
+Każda kolumna ma kilkadziesiąt różnych napisów (kategorii), więc dekodujemy
+tylko je: powstaje mała macierz kategoria x etykieta. Macierz multi-hot
+wiersz x etykieta to ta sama macierz "rozłożona" po kodach kategorii, dlatego
+filtrowanie po etykietach (operacje na zbiorach) liczymy na poziomie kategorii,
+a do wierszy schodzimy jednym ``take``.
+"""
+import numpy as np
+import pandas as pd
+
+LABEL_COLUMNS = [
+    "Klawiatura (labels)",
+    "Obudowa (labels)",
+    "Matryca (labels)",
+    "Problemy (labels)",
+    "Lists",
+    "tags",
+]
+
+# Parametr URL -> kolumna etykiet filtrowana w sidebarze
+LABEL_FILTERS = {
+    "klawiatura": "Klawiatura (labels)",
+    "obudowa": "Obudowa (labels)",
+    "matryca": "Matryca (labels)",
+    "problemy": "Problemy (labels)",
+}
+
+TOUCH_LABEL = "Dotyk"
+
+
+def split_labels(values: pd.Series) -> pd.Series:
+    """``"[a, b]"`` -> ``["a", "b"]`` (po jednym wierszu na etykietę, indeks zachowany)."""
+    exploded = (
+        values.astype(object)
+        .str.strip()
+        .str.strip("[]")
+        .str.split(", ")
+        .explode()
+        .str.strip()
+    )
+    return exploded[exploded.notna() & (exploded != "")]
+
+
+class LabelMatrix:
+    def __init__(self, series: pd.Series):
+        cat = series.astype("category")
+        categories = pd.Series(cat.cat.categories, dtype=object)
+        # Kod -1 (brak wartości) -> ostatni, pusty wiersz macierzy kategorii
+        codes = cat.cat.codes.to_numpy().astype(np.int32)
+        self.row_codes = np.where(codes < 0, len(categories), codes)
+
+        pairs = split_labels(categories)
+        label_codes, vocabulary = pd.factorize(pairs, sort=True)
+        self.vocabulary = pd.Index(vocabulary, name=series.name)
+
+        self.category_matrix = np.zeros((len(categories) + 1, len(vocabulary)), dtype=bool)
+        self.category_matrix[pairs.index.to_numpy(), label_codes] = True
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.row_codes)
+
+    def _label_positions(self, labels) -> np.ndarray:
+        positions = self.vocabulary.get_indexer(list(labels))
+        return positions[positions >= 0]
+
+    def mask(self, all_of=(), any_of=(), none_of=()) -> np.ndarray:
+        """Maska wierszy: mają wszystkie z ``all_of``, choć jedną z ``any_of``
+        i żadnej z ``none_of`` (dokładne dopasowanie etykiet)."""
+        matrix = self.category_matrix
+        category_mask = np.ones(len(matrix), dtype=bool)
+
+        positions = self.vocabulary.get_indexer(list(all_of))
+        if (positions < 0).any():
+            # Etykieta spoza słownika - żaden wiersz jej nie ma
+            return np.zeros(self.n_rows, dtype=bool)
+        if len(positions):
+            category_mask &= matrix[:, positions].all(axis=1)
+        if any_of:
+            category_mask &= matrix[:, self._label_positions(any_of)].any(axis=1)
+        if none_of:
+            category_mask &= ~matrix[:, self._label_positions(none_of)].any(axis=1)
+        return category_mask[self.row_codes]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Rzadka ramka multi-hot: wiersze jak w danych, kolumny = etykiety."""
+        return pd.DataFrame({
+            label: pd.arrays.SparseArray(self.category_matrix[self.row_codes, j], fill_value=False)
+            for j, label in enumerate(self.vocabulary)
+        })
+
+
+def build_label_matrices(df: pd.DataFrame) -> dict:
+    return {col: LabelMatrix(df[col]) for col in LABEL_COLUMNS if col in df.columns}
+
+
+def labels_from_params(query_params: dict) -> dict:
+    """Parametry URL -> ``{parametr: [etykiety]}`` (jak w ``sidebar_label_filters``)."""
+    return {name: list(query_params.get(name, [])) for name in LABEL_FILTERS}
+
+
+def label_filter_mask(matrices: dict, selected: dict):
+    """``{parametr URL: [etykiety]}`` -> maska wierszy albo ``None``, gdy nic nie wybrano."""
+    result = None
+    for name, labels in selected.items():
+        if not labels:
+            continue
+        mask = matrices[LABEL_FILTERS[name]].mask(all_of=labels)
+        result = mask if result is None else result & mask
+    return result
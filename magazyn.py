@@ -0,0 +1,27 @@
+"""Magazyn z ClickUp - wszystkie widoki jako strony jednej aplikacji.
+
+    streamlit run magazyn.py
+
+Strony korzystają z jednego snapshotu danych na proces (``get_snapshot``)
+i jego indeksów, więc proces trzyma jedną kopię DataFrame, a przejście na
+inną stronę niczego nie wczytuje. Dawne skrypty (``app.py`` i pozostałe)
+uruchamiają pojedyncze strony.
+"""
+import streamlit as st
+
+import page_configurations
+import page_coverage
+import page_history
+import page_inventory
+import page_models
+
+st.set_page_config(layout="wide", page_title="Magazyn ClickUp", page_icon="📦")
+
+navigation = st.navigation([
+    st.Page(page_inventory.render, title="Filtry magazynu", icon="🔎", url_path="filtry", default=True),
+    st.Page(page_models.render, title="Modele wystawione", icon="🏷️", url_path="modele"),
+    st.Page(page_configurations.render, title="Konfiguracje", icon="🧮", url_path="konfiguracje"),
+    st.Page(page_coverage.render, title="Pokrycie katalogu", icon="📋", url_path="pokrycie"),
+    st.Page(page_history.render, title="Historia magazynu", icon="📈", url_path="historia"),
+])
+navigation.run()
@@ -0,0 +1,222 @@
+"""Lokalna atrapa API ClickUp do testowania ``clickup_sync.py``.
+
+Serwuje zadania zbudowane z eksportu CSV w formacie API v2
+(``GET /api/v2/team/<id>/task`` z ``page``, ``date_updated_gt``, ``order_by``
+i ``reverse`` - kolejność stron jak w ClickUp, domyślnie po dacie utworzenia).
+
+    python mock_clickup.py --port 8765 --fail-every 5
+
+Zmiana zadania (podbija ``date_updated``, więc trafi do kolejnej synchronizacji;
+nieznana wartość listy rozwijanej lub etykieta dopisuje nową opcję pola):
+
+    curl -X POST localhost:8765/_mock/touch \\
+         -d '{"task_id": "86bwcmxrw", "fields": {"Przeznaczenie (drop down)": "Sklep"}}'
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from csv_stream import IngestReport, read_rows
+from data_loader import FILE_PATH, SEPARATOR
+
+PAGE_SIZE = 100
+
+# order_by -> pole wpisu zadania, po którym sortujemy
+ORDER_FIELDS = {"created": "date_created", "updated": "date_updated", "id": "id"}
+
+COLUMN_RE = re.compile(r"^(?P<name>.+) \((?P<suffix>drop down|labels|short text|text)\)$")
+SUFFIX_TYPES = {"drop down": "drop_down", "labels": "labels", "short text": "short_text", "text": "text"}
+
+
+def _split_labels(value) -> list:
+    if pd.isna(value):
+        return []
+    inner = str(value).strip().strip("[]")
+    return [v for v in inner.split(", ") if v]
+
+
+class MockClickUp:
+    def __init__(self, df: pd.DataFrame):
+        self.lock = threading.Lock()
+        self.fields = self._field_definitions(df)
+        created = int(time.time() * 1000) - 86_400_000
+        self.tasks = {}
+        for i, row in enumerate(df.to_dict("records")):
+            self.tasks[row["Task ID"]] = {
+                "row": row, "id": row["Task ID"], "date_created": created + i, "date_updated": created + i,
+            }
+
+    @staticmethod
+    def _field_definitions(df):
+        fields = {}
+        for col in df.columns:
+            match = COLUMN_RE.match(col)
+            if not match:
+                continue
+            field_type = SUFFIX_TYPES[match["suffix"]]
+            field = {"id": f"cf_{len(fields)}", "name": match["name"], "type": field_type, "type_config": {}}
+            if field_type == "drop_down":
+                values = [str(v) for v in df[col].dropna().unique()]
+                field["type_config"]["options"] = [
+                    {"id": f"dd_{i}", "name": v, "orderindex": i} for i, v in enumerate(values)
+                ]
+            elif field_type == "labels":
+                labels = sorted({label for value in df[col] for label in _split_labels(value)})
+                field["type_config"]["options"] = [{"id": f"lb_{i}", "label": v} for i, v in enumerate(labels)]
+            fields[col] = field
+        return fields
+
+    def _custom_field(self, col, value):
+        field = dict(self.fields[col])
+        options = field["type_config"].get("options", [])
+        if pd.isna(value):
+            field["value"] = None
+        elif field["type"] == "drop_down":
+            field["value"] = next((o["orderindex"] for o in options if o["name"] == str(value)), None)
+        elif field["type"] == "labels":
+            ids = {o["label"]: o["id"] for o in options}
+            field["value"] = [ids[label] for label in _split_labels(value) if label in ids]
+        else:
+            field["value"] = str(value)
+        return field
+
+    def task_json(self, task_id):
+        entry = self.tasks[task_id]
+        row = entry["row"]
+        return {
+            "id": task_id,
+            "name": row["Task Name"],
+            "date_created": str(entry["date_created"]),
+            "date_updated": str(entry["date_updated"]),
+            "tags": [{"name": name} for name in _split_labels(row.get("tags"))],
+            "list": {"id": "list", "name": ", ".join(_split_labels(row.get("Lists")))},
+            "custom_fields": [self._custom_field(col, row.get(col)) for col in self.fields],
+        }
+
+    def tasks_page(self, page: int, updated_gt: int = None, order_by: str = "created",
+                   reverse: bool = False) -> dict:
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"order_by: {order_by}")
+        field = ORDER_FIELDS[order_by]
+        with self.lock:
+            ids = sorted(
+                (tid for tid, e in self.tasks.items() if updated_gt is None or e["date_updated"] > updated_gt),
+                key=lambda tid: (self.tasks[tid][field], tid),
+                reverse=reverse,
+            )
+            chunk = ids[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+            return {
+                "tasks": [self.task_json(tid) for tid in chunk],
+                "last_page": (page + 1) * PAGE_SIZE >= len(ids),
+            }
+
+    def _add_options(self, col, value):
+        """Nowa wartość listy rozwijanej / etykieta dopisuje opcję, jak dodanie jej w ClickUp."""
+        field = self.fields.get(col)
+        if field is None or pd.isna(value):
+            return
+        options = field["type_config"].get("options", [])
+        if field["type"] == "drop_down" and all(o["name"] != str(value) for o in options):
+            options.append({"id": f"dd_{len(options)}", "name": str(value), "orderindex": len(options)})
+        elif field["type"] == "labels":
+            known = {o["label"] for o in options}
+            for label in _split_labels(value):
+                if label not in known:
+                    options.append({"id": f"lb_{len(options)}", "label": label})
+                    known.add(label)
+
+    def touch(self, task_id: str, fields: dict):
+        with self.lock:
+            entry = self.tasks[task_id]
+            for col, value in fields.items():
+                self._add_options(col, value)
+            entry["row"].update(fields)
+            entry["date_updated"] = int(time.time() * 1000)
+
+
+def make_handler(api: MockClickUp, fail_every: int = 0):
+    counter = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            counter["requests"] += 1
+            if fail_every and counter["requests"] % fail_every == 0:
+                self._send_json(503, {"err": "mock: chwilowa niedostępność"})
+                return
+
+            url = urlparse(self.path)
+            if not re.fullmatch(r"/api/v2/team/[^/]+/task", url.path):
+                self._send_json(404, {"err": "Route not found"})
+                return
+            params = parse_qs(url.query)
+            page = int(params.get("page", ["0"])[0])
+            updated_gt = params.get("date_updated_gt", [None])[0]
+            try:
+                result = api.tasks_page(
+                    page,
+                    int(updated_gt) if updated_gt else None,
+                    order_by=params.get("order_by", ["created"])[0],
+                    reverse=params.get("reverse", ["false"])[0].lower() == "true",
+                )
+            except ValueError as e:
+                self._send_json(400, {"err": f"mock: {e}"})
+                return
+            self._send_json(200, result)
+
+        def do_POST(self):
+            if self.path != "/_mock/touch":
+                self._send_json(404, {"err": "Route not found"})
+                return
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            try:
+                api.touch(payload["task_id"], payload.get("fields", {}))
+            except KeyError:
+                self._send_json(404, {"err": "Task not found"})
+                return
+            self._send_json(200, {"ok": True})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(csv_path: str = FILE_PATH, host: str = "127.0.0.1", port: int = 8765, fail_every: int = 0,
+          report: IngestReport = None):
+    """Zadania z tych samych, zwalidowanych wierszy co import (``csv_stream.read_rows``)."""
+    df = read_rows(csv_path, SEPARATOR, report=report)
+    server = ThreadingHTTPServer((host, port), make_handler(MockClickUp(df), fail_every))
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=FILE_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0, help="co N-te zapytanie zwraca 503")
+    args = parser.parse_args(argv)
+
+    report = IngestReport()
+    server = serve(args.csv, args.host, args.port, args.fail_every, report)
+    print(f"{args.csv}: {report.summary()}")
+    print(f"Atrapa ClickUp na http://{args.host}:{args.port}/api/v2")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
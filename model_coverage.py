@@ -0,0 +1,226 @@
+"""Pokrycie katalogu: czy wszystkie oczekiwane konfiguracje są na stanie.
+
+Katalog to CSV z oczekiwanymi konfiguracjami (domyślnie
+``katalog_konfiguracji.csv``):
+
+    tags,CPU_Klucz,GPU_Klucz,Dotyk_flag,Minimum sztuk
+    dell precision 5540,i7-9850h,,Dotyk,5
+    [lenovo thinkpad t14 gen 1],AMD Ryzen 5 4650U,brak,,10
+
+Wartości są ujednolicane tak jak dane (``specs``: "i7-9850h" =
+"Intel Core i7-9850H"). Puste pole = dowolna wartość, "brak" / "-" = pole
+puste w danych. Wynik (brakujące, za mało sztuk, spoza katalogu) liczymy
+z kostki liczności (``aggregations``) złączeniami per zestaw podanych
+kolumn - bez pętli po wierszach - i zapamiętujemy we wspólnym cache wyników
+per snapshot i wersja katalogu.
+"""
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from aggregations import COUNT, TOUCH_COL, TOUCH_VALUES, build_config_cube, rollup
+from result_cache import shared_cache
+from specs import CPU_KEY, GPU_KEY, parse_cpu, parse_gpu
+
+CATALOG_PATH = "katalog_konfiguracji.csv"
+
+KEY_COLUMNS = ["tags", CPU_KEY, GPU_KEY, TOUCH_COL]
+MIN_COL = "Minimum sztuk"
+STATUS_COL = "Status"
+IN_CATALOG_COL = "Model w katalogu"
+
+MISSING = "Brak"
+UNDERSTOCKED = "Za mało"
+COVERED = "OK"
+UNEXPECTED = "Spoza katalogu"
+
+# Jawny brak wartości (np. laptop bez osobnej grafiki) - inny niż "dowolna"
+NO_VALUE = "(brak)"
+_NO_VALUE_TEXT = {"brak", "-", "(brak)", "none"}
+_TOUCH_TEXT = {
+    "dotyk": "Dotyk", "tak": "Dotyk", "1": "Dotyk", "true": "Dotyk",
+    "brak dotyku": "Brak dotyku", "nie": "Brak dotyku", "0": "Brak dotyku", "false": "Brak dotyku",
+}
+
+
+@dataclass
+class Catalog:
+    rows: pd.DataFrame
+    version: str
+    source: str
+
+
+@dataclass
+class CoverageReport:
+    """``expected``: wiersze katalogu + stan i status; ``unexpected``: konfiguracje spoza katalogu."""
+
+    expected: pd.DataFrame
+    unexpected: pd.DataFrame
+
+    @property
+    def missing(self) -> pd.DataFrame:
+        return self.expected[self.expected[STATUS_COL] == MISSING]
+
+    @property
+    def understocked(self) -> pd.DataFrame:
+        return self.expected[self.expected[STATUS_COL] == UNDERSTOCKED]
+
+    def summary(self) -> dict:
+        return {
+            "Oczekiwane": len(self.expected),
+            MISSING: len(self.missing),
+            UNDERSTOCKED: len(self.understocked),
+            COVERED: int((self.expected[STATUS_COL] == COVERED).sum()),
+            UNEXPECTED: len(self.unexpected),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Jedna tabela do eksportu (oczekiwane, potem spoza katalogu)."""
+        return pd.concat([self.expected, self.unexpected], ignore_index=True)
+
+
+def _normalize_text(values: pd.Series) -> pd.Series:
+    text = values.astype(object).where(values.notna(), "").astype(str).str.strip()
+    return text.where(text != "")
+
+
+def _canonical(values: pd.Series, parse) -> pd.Series:
+    """Wolny tekst -> kanoniczny klucz; puste zostaje puste, "brak" -> ``NO_VALUE``."""
+    text = _normalize_text(values)
+    no_value = text.str.lower().isin(_NO_VALUE_TEXT)
+    to_parse = text.notna() & ~no_value
+    result = pd.Series(np.nan, index=values.index, dtype=object)
+    if to_parse.any():
+        uniques = pd.Series(text[to_parse].unique(), dtype=object)
+        keys = parse(uniques)
+        result[to_parse] = text[to_parse].map(dict(zip(uniques, keys)))
+    result[no_value] = NO_VALUE
+    return result
+
+
+def read_catalog(source) -> pd.DataFrame:
+    """CSV katalogu -> ``KEY_COLUMNS`` (ujednolicone, NaN = dowolna) + ``MIN_COL``."""
+    raw = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True, encoding="utf-8-sig")
+    raw.columns = [c.strip() for c in raw.columns]
+    if "tags" not in raw.columns:
+        raise ValueError("Katalog musi mieć kolumnę 'tags'")
+
+    tags = _normalize_text(raw["tags"]).str.lower().str.strip("[]").str.strip()
+    tags = ("[" + tags + "]").where(~tags.isin(_NO_VALUE_TEXT), NO_VALUE).where(tags.notna())
+    touch_text = _normalize_text(raw.get(TOUCH_COL, pd.Series("", index=raw.index)))
+    touch = touch_text.str.lower().map(_TOUCH_TEXT)
+    unknown_touch = touch_text.notna() & touch.isna()
+    if unknown_touch.any():
+        raise ValueError(
+            f"Nieznane wartości {TOUCH_COL}: {', '.join(touch_text[unknown_touch].unique())} "
+            f"(dozwolone: {', '.join(TOUCH_VALUES)}, tak/nie)"
+        )
+
+    minimum = pd.to_numeric(_normalize_text(raw.get(MIN_COL, pd.Series("", index=raw.index))), errors="coerce")
+    return pd.DataFrame({
+        "tags": tags,
+        CPU_KEY: _canonical(raw.get(CPU_KEY, pd.Series("", index=raw.index)),
+                            lambda v: parse_cpu(pd.Series(np.nan, index=v.index), v)[CPU_KEY]),
+        GPU_KEY: _canonical(raw.get(GPU_KEY, pd.Series("", index=raw.index)),
+                            lambda v: parse_gpu(v)[GPU_KEY]),
+        TOUCH_COL: touch,
+        MIN_COL: minimum.fillna(1).clip(lower=1).astype(int),
+    })
+
+
+_catalog_cache = {}
+
+
+def load_catalog(source=CATALOG_PATH) -> Catalog:
+    """Katalog z pliku (zapamiętany do zmiany zawartości) albo z bajtów (np. z uploadu)."""
+    if isinstance(source, bytes):
+        raw, name = source, "upload"
+    else:
+        with open(source, "rb") as f:
+            raw = f.read()
+        name = os.path.basename(source)
+    version = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    catalog = _catalog_cache.get(version)
+    if catalog is None:
+        catalog = Catalog(read_catalog(io.BytesIO(raw)), version, name)
+        _catalog_cache.clear()
+        _catalog_cache[version] = catalog
+    return catalog
+
+
+def stock_configurations(cube: pd.DataFrame) -> pd.DataFrame:
+    """Stan na najdrobniejszym poziomie katalogu; brak wartości jako ``NO_VALUE``."""
+    stock = rollup(cube, KEY_COLUMNS)
+    for col in KEY_COLUMNS:
+        stock[col] = stock[col].astype(object).where(stock[col].notna(), NO_VALUE)
+    return stock
+
+
+def _match_keys(frame: pd.DataFrame) -> pd.DataFrame:
+    # Klucze bez numeru modelu ("Intel Core i7 8. gen.") porównujemy bez wielkości liter
+    return pd.DataFrame({col: frame[col].str.lower() for col in KEY_COLUMNS}, index=frame.index)
+
+
+def coverage(cube: pd.DataFrame, catalog: pd.DataFrame) -> CoverageReport:
+    """Porównanie kostki z katalogiem (złączenia per zestaw podanych kolumn)."""
+    stock = stock_configurations(cube)
+    stock_keys = _match_keys(stock).assign(**{COUNT: stock[COUNT]})
+    catalog_keys = _match_keys(catalog)
+    matched = np.zeros(len(stock), dtype=bool)
+
+    # Wiersze katalogu grupujemy po tym, które kolumny są podane (najwyżej 2^4 zestawów)
+    specified = catalog[KEY_COLUMNS].notna().to_numpy()
+    patterns = specified @ (1 << np.arange(len(KEY_COLUMNS)))
+    parts = []
+    for pattern in np.unique(patterns):
+        rows = catalog[patterns == pattern]
+        row_keys = catalog_keys[patterns == pattern]
+        cols = [c for i, c in enumerate(KEY_COLUMNS) if pattern >> i & 1]
+        if not cols:
+            parts.append(rows.assign(**{COUNT: int(stock[COUNT].sum())}))
+            matched[:] = True
+            continue
+        level = stock_keys.groupby(cols, sort=False)[COUNT].sum().reset_index()
+        # Złączenie lewostronne zachowuje kolejność i liczbę wierszy katalogu (klucze w ``level`` są unikalne)
+        counts = row_keys[cols].merge(level, on=cols, how="left")[COUNT].to_numpy()
+        parts.append(rows.assign(**{COUNT: counts}))
+        # Półzłączenie: konfiguracje ze stanu pasujące do któregokolwiek wiersza katalogu
+        matched |= pd.MultiIndex.from_frame(stock_keys[cols]).isin(pd.MultiIndex.from_frame(row_keys[cols]))
+
+    expected = pd.concat(parts, ignore_index=True) if parts else catalog.assign(**{COUNT: 0})
+    expected[COUNT] = expected[COUNT].fillna(0).astype(int)
+    expected[STATUS_COL] = np.select(
+        [expected[COUNT] == 0, expected[COUNT] < expected[MIN_COL]], [MISSING, UNDERSTOCKED], COVERED
+    )
+    expected = expected.sort_values([STATUS_COL, "tags"], key=_status_order, kind="stable").reset_index(drop=True)
+
+    unexpected = stock[~matched].copy()
+    unexpected[STATUS_COL] = UNEXPECTED
+    unexpected[IN_CATALOG_COL] = unexpected["tags"].isin(catalog["tags"].dropna())
+    unexpected = unexpected.sort_values(COUNT, ascending=False, kind="stable").reset_index(drop=True)
+    return CoverageReport(expected.fillna({c: "" for c in KEY_COLUMNS}), unexpected)
+
+
+def _status_order(values: pd.Series) -> pd.Series:
+    if values.name == STATUS_COL:
+        return values.map({MISSING: 0, UNDERSTOCKED: 1, COVERED: 2})
+    return values
+
+
+def snapshot_coverage(snapshot, catalog: Catalog) -> CoverageReport:
+    """Wynik liczony raz na (snapshot, wersja katalogu); w cache wyników, więc stare
+    wersje wgranych katalogów wypadają po czasie / przy braku miejsca."""
+    cube = snapshot.derived("config_cube", build_config_cube)
+    return shared_cache().get_or_compute(
+        "coverage", snapshot.version, {"katalog": catalog.version}, lambda: coverage(cube, catalog.rows)
+    )
+
+
+def catalog_template(cube: pd.DataFrame) -> pd.DataFrame:
+    """Szablon katalogu z bieżącego stanu (do uzupełnienia ręcznie)."""
+    stock = stock_configurations(cube).sort_values(KEY_COLUMNS, kind="stable")
+    return stock[KEY_COLUMNS].assign(**{MIN_COL: 1}).reset_index(drop=True)
@@ -0,0 +1,153 @@
+"""Strona konfiguracji: czy wszystkie modele są wystawione, zestawienie po CPU, GPU i dotyku."""
+import numpy as np
+import streamlit as st
+
+from data_loader import clear_cache
+from aggregations import build_config_cube, configurations_summary, filter_cube
+from profiling import Profiler, is_enabled
+from specs import AMD, INTEL, cpu_mask
+from table_view import SortIndex
+from widgets import export_widget, load_data, paged_table, profiler_panel
+
+REQUIRED_COLUMNS = [
+    "tags",
+    "Procesor (drop down)",
+    "Model Procesora (short text)",
+    "Grafika (short text)",
+    "Matryca (labels)",
+]
+
+
+def render():
+    st.title("📦 30.04.2026 Sprawdzamy, czy wszystkie modele są wystawione (z możliwością filtrowania konfiguracji)")
+
+    st.caption("Dane z ClickUp – grupowanie po modelu, procesorze, grafice i dotyku "
+               "(model procesora i grafika ujednolicone, np. „P3200 Quadro” = „quadro p3200”).")
+
+    # Pomiar etapów (MAGAZYN_PROFILE=1 albo ?debug=1)
+    profiler = Profiler(
+        "sprawdzamy-czy-wszystkie-modele-wystawione",
+        enabled=is_enabled(st.query_params),
+    )
+
+    # === WCZYTANIE DANYCH ===
+    # Wspólny loader: plik parsowany raz na proces (ponownie tylko po zmianie pliku),
+    # model procesora i Model_Glowny liczone przy wczytaniu; brak wymaganych kolumn zatrzymuje stronę
+    snapshot = load_data(profiler, required_columns=REQUIRED_COLUMNS)
+    df = snapshot.df
+
+    # === PODGLĄD GÓRNEJ TABELI – OGRANICZONY DO 100 ===
+    st.subheader("Podgląd danych (pierwsze 100 wierszy)")
+    st.dataframe(df.head(100), use_container_width=True)
+
+    # === SIDEBAR – USTAWIENIA GRUPOWANIA ===
+    st.sidebar.header("🔧 Ustawienia grupowania")
+
+    if st.sidebar.button("🔄 Odśwież dane"):
+        clear_cache()
+        st.rerun()
+
+    use_cpu_model = st.sidebar.checkbox("Uwzględnij **Model procesora (H)**", value=True)
+    use_gpu = st.sidebar.checkbox("Uwzględnij **Grafikę (I)**", value=True)
+
+    # --- FILTR MINIMALNEJ LICZBY SZTUK ---
+    min_qty = st.sidebar.number_input(
+        "Pokaż konfiguracje z co najmniej X sztukami - ostatnia tabela",
+        min_value=1,
+        max_value=100,
+        value=1,
+        step=1
+    )
+
+    # Kostka liczności (producent x tags x CPU x model CPU x grafika x dotyk) - raz na snapshot;
+    # wszystkie zestawienia poniżej są z niej zwijane
+    with profiler.stage("normalize", rows_in=len(df)) as stage:
+        cube = snapshot.derived("config_cube", build_config_cube)
+        stage.rows_out = len(cube)
+
+    # --- FILTR PRODUCENTA (PIERWSZE SŁOWO Z TAGS) ---
+    st.sidebar.subheader("🏭 Filtr producenta (pierwsze słowo z tags)")
+    all_main_models = sorted(cube["Model_Glowny"].dropna().unique().tolist())
+    selected_main_model = st.sidebar.selectbox(
+        "Wybierz producenta (puste = wszyscy)",
+        ["Wszystkie"] + all_main_models
+    )
+    main_model = None if selected_main_model == "Wszystkie" else selected_main_model
+
+    # --- FILTR MODELI (PEŁNE TAGS) ---
+    st.sidebar.subheader("🎯 Filtr modeli (tags)")
+    all_models = sorted(filter_cube(cube, main_model)["tags"].dropna().unique().tolist())
+    selected_models = st.sidebar.multiselect(
+        "Wybierz modele (puste = wszystkie)",
+        options=all_models,
+    )
+
+    # --- FILTR PROCESORA (PRODUCENT + MINIMALNA GENERACJA) ---
+    st.sidebar.subheader("🧮 Filtr procesora")
+    selected_cpu_vendor = st.sidebar.selectbox("Producent CPU", ["Wszystkie", INTEL, AMD])
+    cpu_vendor = None if selected_cpu_vendor == "Wszystkie" else selected_cpu_vendor
+    min_generation = st.sidebar.number_input(
+        "Generacja CPU co najmniej (0 = bez filtra; AMD: seria Ryzen)",
+        min_value=0,
+        max_value=20,
+        value=0,
+        step=1,
+    )
+
+    # === FILTROWANIE PO PRODUCENCIE, MODELACH I PROCESORZE ===
+    with profiler.stage("filter", rows_in=len(df)) as stage:
+        row_mask = cpu_mask(df, cpu_vendor, min_generation)
+
+        if main_model is not None:
+            row_mask &= (df["Model_Glowny"] == main_model).to_numpy()
+
+        if selected_models:
+            row_mask &= df["tags"].isin(selected_models).to_numpy()
+
+        filtered_rows = np.flatnonzero(row_mask)
+        stage.rows_out = len(filtered_rows)
+
+    st.subheader("📋 Dane po filtrach (producent + tags + procesor)")
+    st.write(f"Liczba wierszy po filtrach: **{len(filtered_rows)}**")
+    # Stronicowanie: do przeglądarki trafia tylko widoczna strona i wybrane kolumny
+    with profiler.stage("render", rows_in=len(filtered_rows)):
+        paged_table(df, filtered_rows, snapshot.derived("sort_index", SortIndex), key="filtered_table")
+
+    # === GRUPOWANIE (zwinięcie kostki) + FILTR PO MINIMALNEJ LICZBIE SZTUK ===
+    # Kolumny: tags + procesor, opcjonalnie model CPU i grafika, zawsze dotyk
+    with profiler.stage("group", rows_in=len(cube)) as stage:
+        grouped = configurations_summary(
+            cube, cpu_model=use_cpu_model, gpu=use_gpu, main_model=main_model, models=selected_models,
+            min_qty=min_qty, cpu_vendor=cpu_vendor, min_generation=min_generation,
+        )
+        stage.rows_out = len(grouped)
+
+    # === WYNIK — PEŁNA TABELA ===
+    st.subheader("📊 Zestawienie konfiguracji (pełna tabela)")
+    st.write(f"Liczba różnych konfiguracji: **{len(grouped)}**")
+
+    st.dataframe(grouped, use_container_width=True)  # pełna tabela
+
+    # === EXPORT DO EXCEL ===
+    # Plik budowany w pamięci dopiero po kliknięciu, zapamiętany per ustawienia
+    with profiler.stage("export", rows_in=len(grouped)):
+        export_widget(
+            lambda: grouped,
+            n_rows=len(grouped),
+            state={
+                "main_model": selected_main_model,
+                "models": selected_models,
+                "cpu_model": use_cpu_model,
+                "gpu": use_gpu,
+                "min_qty": min_qty,
+                "cpu_vendor": selected_cpu_vendor,
+                "min_generation": min_generation,
+            },
+            version=snapshot.version,
+            file_stem="zestawienie_konfiguracji_magazynu",
+            key="grouped_export",
+            sheet_name="Zestawienie",
+            label="📥 Pobierz zestawienie jako",
+        )
+
+    profiler_panel(profiler)
@@ -0,0 +1,104 @@
+"""Strona pokrycia katalogu: brakujące, niedostateczne i nieoczekiwane konfiguracje."""
+import os
+
+import streamlit as st
+
+from aggregations import build_config_cube
+from data_loader import clear_cache
+from export import to_csv_bytes
+from model_coverage import (
+    CATALOG_PATH,
+    IN_CATALOG_COL,
+    MIN_COL,
+    UNEXPECTED,
+    catalog_template,
+    load_catalog,
+    snapshot_coverage,
+)
+from profiling import Profiler, is_enabled
+from widgets import export_widget, load_data, profiler_panel
+
+
+def _catalog_source():
+    """Wgrany plik ma pierwszeństwo przed ``katalog_konfiguracji.csv`` obok kodu."""
+    uploaded = st.sidebar.file_uploader("Katalog konfiguracji (CSV)", type=["csv"])
+    if uploaded is not None:
+        return uploaded.getvalue()
+    if os.path.exists(CATALOG_PATH):
+        return CATALOG_PATH
+    return None
+
+
+def render():
+    st.title("📋 Pokrycie katalogu konfiguracji")
+    st.caption("Oczekiwane konfiguracje (tags x CPU x GPU x dotyk) z katalogu porównane ze stanem magazynu. "
+               "Puste pole w katalogu = dowolna wartość, „brak” = pole puste w ClickUp.")
+
+    profiler = Profiler("pokrycie-katalogu", enabled=is_enabled(st.query_params))
+    snapshot = load_data(profiler)
+
+    st.sidebar.header("📋 Katalog")
+    if st.sidebar.button("🔄 Odśwież dane"):
+        clear_cache()
+        st.rerun()
+
+    source = _catalog_source()
+    if source is None:
+        st.info(f"Brak katalogu: wgraj plik CSV w panelu bocznym albo zapisz go jako `{CATALOG_PATH}`. "
+                "Szablon poniżej zawiera wszystkie konfiguracje z bieżącego stanu "
+                f"(kolumna „{MIN_COL}” = 1) - wystarczy usunąć zbędne wiersze i ustawić minima.")
+        st.download_button(
+            "📥 Pobierz szablon katalogu",
+            data=to_csv_bytes(catalog_template(snapshot.derived("config_cube", build_config_cube))),
+            file_name=CATALOG_PATH,
+            mime="text/csv",
+        )
+        profiler_panel(profiler)
+        return
+
+    try:
+        with profiler.stage("load_catalog") as stage:
+            catalog = load_catalog(source)
+            stage.rows_out = len(catalog.rows)
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Błąd w katalogu: {e}")
+        st.stop()
+
+    # Wynik raz na (snapshot, wersja katalogu) - kolejne przebiegi i sesje biorą gotowy
+    with profiler.stage("coverage", rows_in=len(catalog.rows)) as stage:
+        report = snapshot_coverage(snapshot, catalog)
+        stage.rows_out = len(report.expected) + len(report.unexpected)
+
+    summary = report.summary()
+    for column, (name, value) in zip(st.columns(len(summary)), summary.items()):
+        column.metric(name, value)
+
+    missing_tab, under_tab, unexpected_tab, all_tab = st.tabs(
+        ["❌ Brakujące", "⚠️ Za mało sztuk", "❓ Spoza katalogu", "📋 Cały katalog"]
+    )
+    with missing_tab:
+        st.dataframe(report.missing, hide_index=True, use_container_width=True)
+    with under_tab:
+        st.dataframe(report.understocked, hide_index=True, use_container_width=True)
+    with unexpected_tab:
+        unexpected = report.unexpected
+        if st.checkbox("Tylko modele obecne w katalogu", value=True):
+            unexpected = unexpected[unexpected[IN_CATALOG_COL]]
+        st.caption(f"{UNEXPECTED}: {len(unexpected)} konfiguracji")
+        st.dataframe(unexpected, hide_index=True, use_container_width=True)
+    with all_tab:
+        st.dataframe(report.expected, hide_index=True, use_container_width=True)
+
+    st.subheader("💾 Eksport raportu")
+    export_widget(
+        report.to_frame,
+        n_rows=summary["Oczekiwane"] + summary[UNEXPECTED],
+        state={"katalog": catalog.version},
+        version=snapshot.version,
+        file_stem="pokrycie_katalogu",
+        key="coverage_export",
+        sheet_name="Pokrycie",
+        label="📥 Pobierz raport jako",
+    )
+
+    profiler_panel(profiler)
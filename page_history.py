@@ -0,0 +1,104 @@
+"""Strona historii: ruch między importami zapisanymi w ``history.HistoryStore``."""
+import pandas as pd
+import streamlit as st
+
+from data_loader import FILE_PATH, SEPARATOR, get_snapshot
+from history import TASK_ID, HistoryStore
+from widgets import export_widget
+
+DETAIL_COLUMNS = ["Task Name", "tags"]
+
+
+@st.cache_resource
+def get_store() -> HistoryStore:
+    # Jeden magazyn historii na proces - wczytane manifesty współdzielone między sesjami
+    return HistoryStore()
+
+
+def with_details(store: HistoryStore, frame: pd.DataFrame, snapshot_id: str) -> pd.DataFrame:
+    """Dołącza nazwę i tagi - czytane tylko dla zadań z tabeli."""
+    if frame.empty:
+        return frame
+    details = store.load(snapshot_id, task_ids=frame[TASK_ID], columns=DETAIL_COLUMNS)
+    return frame.merge(details, on=TASK_ID, how="left")
+
+
+def render():
+    st.title("📈 Historia magazynu – ruch między importami")
+    st.caption("Każdy import zapisany w historii (`python history.py add` albo przycisk poniżej); "
+               "porównanie liczone po skrótach wierszy, bez wczytywania pełnych danych.")
+
+    store = get_store()
+
+    if st.sidebar.button("📥 Dopisz bieżący eksport do historii"):
+        try:
+            snapshot_id = store.add(get_snapshot(FILE_PATH, SEPARATOR).df, source=FILE_PATH)
+            st.sidebar.success(f"Zapisano import {snapshot_id}")
+        except FileNotFoundError:
+            st.sidebar.error(f"Nie znaleziono pliku: {FILE_PATH}.")
+        except ValueError as e:
+            st.sidebar.error(str(e))
+
+    snapshots = store.snapshots()
+    if len(snapshots) < 2:
+        st.info("Do porównania potrzebne są co najmniej dwa importy w historii. "
+                "Dopisz eksport: `python history.py add nazwa_pliku.csv`.")
+        st.dataframe(snapshots, use_container_width=True)
+        st.stop()
+
+    labels = {
+        row.id: f"{row.data:%Y-%m-%d %H:%M} ({row.wiersze} poz.)"
+        for row in snapshots.itertuples()
+    }
+    ids = snapshots["id"].tolist()
+
+    st.sidebar.header("Porównanie")
+    old_id = st.sidebar.selectbox("Od", ids, index=len(ids) - 2, format_func=labels.get)
+    new_id = st.sidebar.selectbox("Do", ids, index=len(ids) - 1, format_func=labels.get)
+    if old_id == new_id:
+        st.warning("Wybierz dwa różne importy.")
+        st.stop()
+
+    diff = store.diff(old_id, new_id)
+
+    for column, (name, count) in zip(st.columns(len(diff.summary())), diff.summary().items()):
+        column.metric(name, count)
+
+    tables = {
+        "Nowe": with_details(store, diff.added, new_id),
+        "Usunięte": with_details(store, diff.removed, old_id),
+        "Przeniesione (regał)": with_details(store, diff.moved, new_id),
+        "Zmiana przeznaczenia": with_details(store, diff.destination_changed, new_id),
+        "Inne zmiany": with_details(store, diff.changed, new_id),
+    }
+
+    for tab, (name, table) in zip(st.tabs(list(tables)), tables.items()):
+        with tab:
+            st.dataframe(table, use_container_width=True, height=400)
+
+    # === PRZEPŁYWY: SKĄD -> DOKĄD ===
+    st.subheader("🔀 Przepływy")
+    left, right = st.columns(2)
+    with left:
+        st.write("Przeznaczenie: przed → po")
+        if len(diff.destination_changed):
+            st.dataframe(pd.crosstab(diff.destination_changed["przed"], diff.destination_changed["po"]))
+    with right:
+        st.write("Regał: przed → po")
+        if len(diff.moved):
+            flows = diff.moved.groupby(["przed", "po"], dropna=False).size().reset_index(name="Ilość sztuk")
+            st.dataframe(flows.sort_values("Ilość sztuk", ascending=False), hide_index=True)
+
+    # === EKSPORT ===
+    export_widget(
+        lambda: pd.concat(
+            [table.assign(Zmiana=name) for name, table in tables.items()], ignore_index=True
+        ),
+        n_rows=sum(len(t) for t in tables.values()),
+        state={"od": old_id, "do": new_id},
+        version=f"{old_id}-{new_id}",
+        file_stem=f"ruch_magazynu_{old_id}_{new_id}",
+        key="history_export",
+        sheet_name="Zmiany",
+        label="📥 Pobierz zmiany jako",
+    )
@@ -0,0 +1,38 @@
+"""Strona filtrów magazynu: facety, etykiety, wyszukiwanie, tabela i eksport."""
+import streamlit as st
+
+from aggregations import build_config_cube, tags_summary
+from profiling import Profiler, is_enabled
+from widgets import filtered_items, load_data, profiler_panel, url_params
+
+
+def render():
+    st.title("Magazyn z ClickUp - aktualizacja 29.06.2026 - wersja BETA")
+
+    # Odczyt parametrów z URL (jeśli istnieją)
+    query_params = url_params()
+
+    # Pomiar etapów (MAGAZYN_PROFILE=1 albo ?debug=1) - wyłączony prawie nic nie kosztuje
+    profiler = Profiler("app", enabled=is_enabled(query_params))
+
+    # Wspólny, współdzielony między sesjami DataFrame (tylko do odczytu)
+    snapshot = load_data(profiler)
+    df = snapshot.df
+
+    try:
+        filtered_items(snapshot, profiler, query_params, labels=True)
+
+        st.write("### Pogrupowane modele - całość")
+        with st.expander("Pokaż/ukryj tabelę z tagami", expanded=False):
+            with profiler.stage("group", rows_in=len(df)) as stage:
+                cube = snapshot.derived("config_cube", build_config_cube)
+                summary = tags_summary(cube)
+                stage.rows_out = len(summary)
+            st.dataframe(summary, height=500)
+
+        profiler_panel(profiler)
+
+    except KeyError as e:
+        st.error(f"Brak wymaganej kolumny w pliku CSV: {e}")
+    except Exception as e:
+        st.error(f"Nieoczekiwany błąd: {e}")
@@ -0,0 +1,39 @@
+"""Strona modeli: filtry magazynu i zestawienie tagi + procesor + model."""
+import streamlit as st
+
+from aggregations import build_config_cube, models_summary
+from profiling import Profiler, is_enabled
+from widgets import filtered_items, load_data, profiler_panel, url_params
+
+
+def render():
+    st.title("Magazyn z ClickUp - aktualizacja 29.05.2025 - wersja BETA")
+
+    # Pobranie parametrów z URL
+    query_params = url_params()
+
+    # Pomiar etapów (MAGAZYN_PROFILE=1 albo ?debug=1)
+    profiler = Profiler("spr-czy-modele-wystawione", enabled=is_enabled(query_params))
+
+    # Wspólny loader - plik parsowany raz na proces, model procesora już znormalizowany
+    snapshot = load_data(profiler)
+    df = snapshot.df
+
+    try:
+        # Bez filtrów etykiet - jak w pierwotnym skrypcie
+        filtered_items(snapshot, profiler, query_params, labels=False)
+
+        st.write("### Pogrupowane modele – tagi + procesor + model (malejąco)")
+        # Zwinięcie kostki liczności liczonej raz na snapshot (zamiast value_counts po wszystkich wierszach)
+        with profiler.stage("group", rows_in=len(df)) as stage:
+            cube = snapshot.derived("config_cube", build_config_cube)
+            summary = models_summary(cube)
+            stage.rows_out = len(summary)
+        st.dataframe(summary, height=500)
+
+        profiler_panel(profiler)
+
+    except KeyError as e:
+        st.error(f"Brak wymaganej kolumny w pliku CSV: {e}")
+    except Exception as e:
+        st.error(f"Nieoczekiwany błąd: {e}")
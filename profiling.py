@@ -0,0 +1,132 @@
+"""Lekki pomiar etapów stron (czas, wiersze we/wy, pamięć) na jeden przebieg.
+
+Włączany zmienną środowiskową ``MAGAZYN_PROFILE=1`` albo parametrem URL
+``?debug=1``. Wyłączony profiler zwraca wspólny, pusty kontekst - koszt to
+jedno wywołanie funkcji na etap.
+
+Wyniki trafiają do panelu w sidebarze (``widgets.profiler_panel``) i do
+rotowanego logu JSON (jedna linia na przebieg strony).
+"""
+import json
+import logging
+import logging.handlers
+import os
+import time
+from typing import Optional
+
+ENV_VAR = "MAGAZYN_PROFILE"
+LOG_PATH = os.environ.get("MAGAZYN_PROFILE_LOG", "logs/profile.jsonl")
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUPS = 5
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_mb() -> Optional[float]:
+    """Bieżący RSS procesu (szczyt ``ru_maxrss`` jest z całego życia procesu, więc po
+    pierwszym przebiegu już się nie zmienia); bez ``/proc`` - ``None``."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _json_logger() -> logging.Logger:
+    logger = logging.getLogger("magazyn.profile")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class _NullStage:
+    """Kontekst wyłączonego profilera - nic nie mierzy."""
+
+    rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows_in):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        self._rss_before = _rss_mb()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        rss = _rss_mb()
+        measured = rss is not None and self._rss_before is not None
+        self.profiler.stages.append({
+            "stage": self.name,
+            "ms": round(seconds * 1000, 2),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rss_mb": round(rss, 1) if measured else None,
+            "rss_delta_mb": round(rss - self._rss_before, 1) if measured else None,
+        })
+        self.profiler.observe_rss(self._rss_before, rss)
+        return False
+
+
+class Profiler:
+    def __init__(self, page: str, enabled: bool = False):
+        self.page = page
+        self.enabled = enabled
+        self.stages = []
+        self.peak_rss_mb = None
+        self._start = time.perf_counter()
+
+    def observe_rss(self, *values):
+        """Najwyższy RSS zmierzony w tym przebiegu (na granicach etapów)."""
+        for value in values:
+            if value is not None and (self.peak_rss_mb is None or value > self.peak_rss_mb):
+                self.peak_rss_mb = value
+
+    def stage(self, name: str, rows_in: int = None):
+        """``with profiler.stage("filter", rows_in=len(df)) as s: ...; s.rows_out = n``"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows_in)
+
+    def finish(self) -> list:
+        if not self.enabled:
+            return []
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page": self.page,
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 2),
+            "peak_rss_mb": None if self.peak_rss_mb is None else round(self.peak_rss_mb, 1),
+            "stages": self.stages,
+        }
+        _json_logger().info(json.dumps(record, ensure_ascii=False))
+        return self.stages
+
+
+def is_enabled(query_params=None) -> bool:
+    """``query_params``: ``st.query_params`` (napisy) albo słownik list (``widgets.url_params``, API)."""
+    if os.environ.get(ENV_VAR, "") not in ("", "0"):
+        return True
+    value = (query_params or {}).get("debug", "0")
+    if isinstance(value, list):
+        value = value[0] if value else "0"
+    return value not in ("", "0")
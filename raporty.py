@@ -0,0 +1,155 @@
+"""Codzienne raporty Excel: osobny skoroszyt dla każdej listy (``Lists``) plus zbiorczy.
+
+    python raporty.py --out raporty "destinations=Magazyn&matryca=Dotyk"
+
+Filtry jak w URL ``app.py`` / API (``tag``, ``destinations``, etykiety, ``q``).
+Każdy skoroszyt ma arkusze:
+
+    Pozycje        przefiltrowane pozycje (kolumny eksportu)
+    Modele         tagi + procesor + model (``models_summary``)
+    Konfiguracje   tags + procesor + model CPU + grafika + dotyk (``configurations_summary``)
+    Tagi           liczba egzemplarzy na tag (``tags_summary``)
+
+Snapshot wczytujemy i filtrujemy raz. Pozycje każdej listy trafiają do
+osobnego, tymczasowego pliku Parquet, a skoroszyty piszą równolegle procesy
+z puli - każdy czyta tylko swoją część i zapisuje ją przez xlsxwriter w
+trybie ``constant_memory`` prosto do pliku. Pamięć procesu roboczego zależy
+od wielkości jednej listy, nie od liczby raportów.
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from urllib.parse import parse_qs
+
+import numpy as np
+import pandas as pd
+
+from aggregations import build_config_cube, configurations_summary, models_summary, tags_summary
+from api import select_rows
+from csv_stream import SchemaError
+from data_loader import FILE_PATH, SEPARATOR, get_snapshot, read_snapshot, source_view, write_snapshot
+from export import EXCEL_MAX_ROWS, write_excel
+from search import fold
+
+REPORT_DIR = "raporty"
+LIST_COL = "Lists"
+ALL_LISTS = "wszystkie"
+NO_LIST = "bez_listy"
+
+
+def report_sheets(items: pd.DataFrame) -> dict:
+    """Arkusze jednego raportu - te same zestawienia co na stronach, z kostki tych pozycji."""
+    cube = build_config_cube(items)
+    return {
+        "Pozycje": source_view(items),
+        "Modele": models_summary(cube),
+        "Konfiguracje": configurations_summary(cube),
+        "Tagi": tags_summary(cube),
+    }
+
+
+def _slugs(values: pd.Series) -> list:
+    """``"[2026.03.23 - HOLANDIA]"`` -> ``"2026_03_23_holandia"``; unikalne nazwy plików."""
+    text = fold(values.str.strip("[]")).str.replace(r"[^a-z0-9]+", "_", regex=True).str.strip("_")
+    slugs, seen = [], {}
+    for slug in text.fillna(NO_LIST):
+        slug = slug or NO_LIST
+        seen[slug] = seen.get(slug, 0) + 1
+        slugs.append(slug if seen[slug] == 1 else f"{slug}_{seen[slug]}")
+    return slugs
+
+
+def plan_reports(df: pd.DataFrame, rows: np.ndarray, with_total: bool = True) -> list:
+    """(nazwa, pozycje wierszy) dla każdej listy z wybranych wierszy; zbiorczy na początku."""
+    codes, lists = pd.factorize(df[LIST_COL].to_numpy()[rows], use_na_sentinel=True)
+    # Pozycje pogrupowane po liście jednym sortowaniem, kolejność w liście jak w danych
+    order = np.argsort(codes, kind="stable")
+    # Grupa 0 to wiersze bez listy (kod -1), grupa g > 0 to lista g - 1
+    bounds = np.zeros(len(lists) + 2, dtype=np.int64)
+    np.cumsum(np.bincount(codes + 1, minlength=len(lists) + 1), out=bounds[1:])
+    names = _slugs(pd.Series([np.nan, *lists], dtype=object))
+    plan = [(names[g], rows[order[bounds[g]:bounds[g + 1]]]) for g in range(len(lists) + 1)]
+    plan = [(name, part) for name, part in plan if len(part)]
+    if with_total:
+        plan.insert(0, (ALL_LISTS, rows))
+    return plan
+
+
+def write_report(parts_path: str, out_path: str) -> tuple:
+    """Zadanie procesu roboczego: część z Parquet -> skoroszyt xlsx. Zwraca (ścieżka, pozycje, sekundy)."""
+    start = time.perf_counter()
+    items = read_snapshot(parts_path)
+    write_excel(out_path, report_sheets(items))
+    return out_path, len(items), time.perf_counter() - start
+
+
+def generate_reports(csv_path: str = FILE_PATH, sep: str = SEPARATOR, params: dict = None,
+                     out_dir: str = REPORT_DIR, day: date = None, workers: int = None,
+                     with_total: bool = True):
+    """Wszystkie raporty z jednego snapshotu; zwraca listę (ścieżka, pozycje, sekundy) w kolejności ukończenia."""
+    snapshot = get_snapshot(csv_path, sep)
+    rows, _, _ = select_rows(snapshot, params or {})
+    plan = plan_reports(snapshot.df, rows, with_total)
+    too_big = [name for name, part in plan if len(part) > EXCEL_MAX_ROWS]
+    if too_big:
+        raise ValueError(f"Raporty przekraczają limit wierszy arkusza Excel: {', '.join(too_big)}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    prefix = f"raport_{(day or date.today()).isoformat()}"
+    tmp_dir = tempfile.mkdtemp(prefix=".raporty_", dir=out_dir)
+    try:
+        tasks = []
+        for name, part in plan:
+            # Procesy robocze dostają ścieżki, nie ramki - rodzic nie trzyma kopii wszystkich części
+            parts_path = os.path.join(tmp_dir, f"{name}.parquet")
+            write_snapshot(snapshot.df.iloc[part], parts_path)
+            tasks.append((parts_path, os.path.join(out_dir, f"{prefix}_{name}.xlsx")))
+
+        done = []
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tasks) or 1)) as pool:
+            futures = [pool.submit(write_report, *task) for task in tasks]
+            for future in as_completed(futures):
+                done.append(future.result())
+        return done
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("filtry", nargs="?", default="", help="filtry w składni URL, np. 'destinations=Magazyn'")
+    parser.add_argument("--csv", default=FILE_PATH)
+    parser.add_argument("--sep", default=SEPARATOR)
+    parser.add_argument("--out", default=REPORT_DIR, help="katalog na skoroszyty")
+    parser.add_argument("--data", type=date.fromisoformat, default=None, help="data w nazwach plików (RRRR-MM-DD)")
+    parser.add_argument("--procesy", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--bez-zbiorczego", action="store_true", help="bez skoroszytu ze wszystkimi listami")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        done = generate_reports(
+            args.csv, args.sep, parse_qs(re.sub(r"^\?", "", args.filtry)), args.out, args.data,
+            args.procesy, with_total=not args.bez_zbiorczego,
+        )
+    except FileNotFoundError as e:
+        print(f"Nie znaleziono pliku: {e.filename}", file=sys.stderr)
+        return 1
+    except (SchemaError, ValueError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 1
+
+    for path, n_items, seconds in sorted(done):
+        print(f"{path}: {n_items} pozycji, {seconds:.2f} s")
+    print(f"Raporty: {len(done)} w {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Wspólny dla całego procesu cache wyników: przefiltrowane wiersze, facety, pliki eksportu.
+
+Klucz to przestrzeń (np. ``"items_rows"``), wersja snapshotu i kanoniczny stan
+filtrów - ten sam, który trafia do udostępnianego linku. Kolejne osoby
+otwierające ten link dostają gotowy wynik, niezależnie od sesji Streamlit.
+
+Wpisy wypadają:
+  * po czasie (``ttl``),
+  * najdawniej użyte, gdy przekroczona liczba wpisów albo łączny rozmiar,
+  * od razu, gdy w danej przestrzeni pojawi się nowa wersja danych
+    (zmieniony plik = nowa wersja snapshotu, stare wyniki są bezużyteczne).
+"""
+import dataclasses
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from filter_index import ALL
+
+MAX_ENTRIES = 512
+MAX_BYTES = 256 * 2**20
+TTL_SECONDS = 15 * 60
+
+_MISSING = object()
+
+
+def _canonical_value(value):
+    if isinstance(value, (list, tuple, set)):
+        values = sorted(_canonical_value(v) for v in value)
+        # Jednoelementowa lista to to samo co pojedyncza wartość (?destinations=Magazyn)
+        return values[0] if len(values) == 1 else tuple(values)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return "<NA>"
+    return str(value)
+
+
+def canonical_state(state: dict) -> tuple:
+    """Stan filtrów -> krotka niezależna od kolejności parametrów i wartości oraz od pustych filtrów."""
+    items = []
+    for name, value in state.items():
+        value = _canonical_value(value)
+        if value in ((), "", ALL):
+            continue
+        items.append((name, value))
+    return tuple(sorted(items))
+
+
+def _size(value) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_size(v) for v in value.values())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # np. raport pokrycia: liczymy ramki w środku, nie sam obiekt
+        return sum(_size(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # Wynik jest współdzielony między sesjami i wątkami - tablice tylko do odczytu
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES,
+                 ttl: float = TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # klucz -> (wartość, rozmiar, czas zapisu)
+        self._versions = {}
+        self._pending = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, _, stored_at = entry
+        if self._clock() - stored_at > self.ttl:
+            self._drop(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        namespace, version, _ = key
+        if self._versions.get(namespace) != version:
+            # Nowa wersja danych: wyniki poprzedniej w tej przestrzeni już nie trafią
+            for stale in [k for k in self._entries if k[0] == namespace and k[1] != version]:
+                self._drop(stale)
+            self._versions[namespace] = version
+        if key in self._entries:
+            self._drop(key)
+        size = _size(value)
+        self._entries[key] = (value, size, self._clock())
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+
+    def get_or_compute(self, namespace: str, version: str, state: dict, compute):
+        """Wynik dla (przestrzeń, wersja, stan); przy braku liczy ``compute()`` - raz,
+        nawet gdy ten sam link otwiera jednocześnie kilka osób."""
+        key = (namespace, version, canonical_state(state))
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    self.hits += 1
+                    return value
+                self.misses += 1
+            try:
+                value = _freeze(compute())
+                with self._lock:
+                    self._store(key, value)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"wpisy": len(self._entries), "bajty": self._bytes, "trafienia": self.hits, "chybienia": self.misses}
+
+
+_shared = ResultCache()
+
+
+def shared_cache() -> ResultCache:
+    """Jeden cache na proces - wspólny dla wszystkich sesji Streamlit i wątków API."""
+    return _shared
@@ -0,0 +1,172 @@
+"""Wyszukiwanie po numerze seryjnym, zamówieniu i uwagach.
+
+Indeks budujemy raz na snapshot (``Snapshot.derived``): teksty są
+normalizowane (małe litery, bez polskich znaków), dzielone na słowa, a każde
+słowo ma listę wierszy, w których występuje. Dla tolerancji literówek słowa
+są dodatkowo rozpisane na trigramy - zapytanie porównujemy tylko ze słownikiem
+słów (kilka-kilkanaście tysięcy), nie z wierszami.
+"""
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ["Task Name", "Zamówienie (short text)", "Uwagi (text)"]
+
+# Parametr URL z treścią wyszukiwania
+SEARCH_PARAM = "q"
+
+# ł nie rozkłada się w NFKD, więc zamieniamy je ręcznie
+_FOLD_TABLE = str.maketrans({"ł": "l", "Ł": "l"})
+_TOKEN_RE = r"[a-z0-9]+"
+
+# Waga dopasowania słowa z zapytania do słowa w indeksie
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+INFIX_SCORE = 0.7
+FUZZY_SCORE = 0.6
+MIN_SIMILARITY = 0.4
+
+
+def fold(values: pd.Series) -> pd.Series:
+    """``"Rozdzielczość"`` -> ``"rozdzielczosc"`` (wektorowo, braki zostają brakami)."""
+    return (
+        values.astype(object)
+        .str.translate(_FOLD_TABLE)
+        .str.lower()
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+    )
+
+
+def tokenize(text: str) -> list:
+    folded = fold(pd.Series([text], dtype=object)).iloc[0]
+    return pd.Series([folded]).str.findall(_TOKEN_RE).iloc[0] if isinstance(folded, str) else []
+
+
+def _trigrams(token: str) -> set:
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n_keys: int):
+    """Pary (klucz, wartość) -> (wskaźniki, wartości posortowane po kluczu)."""
+    order = np.argsort(keys, kind="stable")
+    ptr = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=ptr[1:])
+    return ptr, values[order]
+
+
+class SearchIndex:
+    def __init__(self, df: pd.DataFrame, columns=None):
+        self.n_rows = len(df)
+        self.columns = [c for c in (columns or SEARCH_COLUMNS) if c in df.columns]
+
+        pair_rows, pair_tokens = [], []
+        for col in self.columns:
+            # Normalizujemy tylko unikalne napisy, do wierszy schodzimy po kodach
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+            words = fold(pd.Series(uniques, dtype=object)).str.findall(_TOKEN_RE).explode().dropna()
+            if words.empty:
+                continue
+            rows_by_code = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            starts = np.cumsum(counts) - counts + np.count_nonzero(codes < 0)
+            unique_codes = words.index.to_numpy()
+            n = counts[unique_codes]
+            # Dla każdej pary (napis, słowo) wszystkie wiersze z tym napisem
+            offsets = np.repeat(starts[unique_codes] - np.cumsum(n) + n, n) + np.arange(n.sum())
+            pair_rows.append(rows_by_code[offsets])
+            pair_tokens.append(np.repeat(words.to_numpy(dtype=object), n))
+
+        if pair_rows:
+            rows = np.concatenate(pair_rows)
+            token_codes, vocabulary = pd.factorize(np.concatenate(pair_tokens), sort=True)
+        else:
+            rows = np.zeros(0, dtype=np.int64)
+            token_codes, vocabulary = np.zeros(0, dtype=np.int64), np.array([], dtype=object)
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        self._token_ptr, self._token_rows = _csr(token_codes, rows, len(self.vocabulary))
+
+        # Trigram -> słowa ze słownika (wycinki na kolejnych pozycjach, wektorowo)
+        padded = " " + pd.Series(self.vocabulary, dtype=object) + " "
+        lengths = padded.str.len().to_numpy()
+        grams, gram_tokens = [], []
+        for start in range(int(lengths.max(initial=3)) - 2):
+            tokens = np.flatnonzero(lengths >= start + 3)
+            grams.append(padded.iloc[tokens].str.slice(start, start + 3).to_numpy())
+            gram_tokens.append(tokens)
+        pairs = pd.DataFrame({
+            "gram": np.concatenate(grams) if grams else np.array([], dtype=object),
+            "token": np.concatenate(gram_tokens) if gram_tokens else np.array([], dtype=np.int64),
+        }).drop_duplicates()
+        gram_codes, gram_values = pd.factorize(pairs["gram"])
+        self._gram_lookup = {gram: code for code, gram in enumerate(gram_values)}
+        gram_token_ids = pairs["token"].to_numpy(dtype=np.int64)
+        self._gram_ptr, self._gram_tokens = _csr(gram_codes, gram_token_ids, len(gram_values))
+        self._gram_counts = np.bincount(gram_token_ids, minlength=len(self.vocabulary))
+
+    def _term_scores(self, term: str) -> np.ndarray:
+        """Waga każdego słowa ze słownika dla jednego słowa zapytania."""
+        scores = np.zeros(len(self.vocabulary), dtype=np.float32)
+
+        # Prefiks: spójny zakres posortowanego słownika
+        lo = np.searchsorted(self.vocabulary, term, side="left")
+        hi = np.searchsorted(self.vocabulary, term + "\x7f", side="left")
+        scores[lo:hi] = PREFIX_SCORE
+        if lo < hi and self.vocabulary[lo] == term:
+            scores[lo] = EXACT_SCORE
+        if len(term) < 3:
+            return scores
+
+        # Trigramy: kandydaci z choć jednym wspólnym trigramem
+        grams = _trigrams(term)
+        codes = [self._gram_lookup[g] for g in grams if g in self._gram_lookup]
+        if not codes:
+            return scores
+        candidates = np.concatenate([self._gram_tokens[self._gram_ptr[c]:self._gram_ptr[c + 1]] for c in codes])
+        shared = np.bincount(candidates, minlength=len(self.vocabulary))
+        candidates = np.flatnonzero(shared)
+        # Podobieństwo Jaccarda zbiorów trigramów
+        similarity = shared[candidates] / (self._gram_counts[candidates] + len(grams) - shared[candidates])
+        infix = np.char.find(self.vocabulary[candidates], term) >= 0
+        term_scores = np.where(infix, INFIX_SCORE, np.where(similarity >= MIN_SIMILARITY, FUZZY_SCORE * similarity, 0))
+        scores[candidates] = np.maximum(scores[candidates], term_scores)
+        return scores
+
+    def scores(self, query: str) -> np.ndarray:
+        """Trafność każdego wiersza (0 = brak dopasowania); wiersz musi pasować do wszystkich słów."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        total = np.zeros(self.n_rows, dtype=np.float32)
+        matched = np.ones(self.n_rows, dtype=bool)
+        for term in dict.fromkeys(terms):
+            token_scores = self._term_scores(term)
+            tokens = np.flatnonzero(token_scores)
+            row_scores = np.zeros(self.n_rows, dtype=np.float32)
+            if len(tokens):
+                starts, stops = self._token_ptr[tokens], self._token_ptr[tokens + 1]
+                n = stops - starts
+                positions = np.repeat(starts - np.cumsum(n) + n, n) + np.arange(n.sum())
+                # Wiersz dostaje najlepsze dopasowanie spośród swoich słów
+                np.maximum.at(row_scores, self._token_rows[positions], np.repeat(token_scores[tokens], n))
+            matched &= row_scores > 0
+            total += row_scores
+        total[~matched] = 0
+        return total
+
+    def search(self, query: str, rows=None, limit: int = None) -> np.ndarray:
+        """Pozycje pasujących wierszy (opcjonalnie tylko spośród ``rows``) od najtrafniejszych."""
+        scores = self.scores(query)
+        if scores is None:
+            return np.arange(self.n_rows) if rows is None else rows
+        if rows is None:
+            rows = np.flatnonzero(scores)
+        ranked = rank(rows, scores)
+        return ranked[:limit]
+
+
+def rank(rows: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """``rows`` z dopasowaniem, od najwyższej trafności (przy remisie kolejność danych)."""
+    rows = rows[scores[rows] > 0]
+    return rows[np.argsort(-scores[rows], kind="stable")]
@@ -0,0 +1,232 @@
+"""Znormalizowana specyfikacja sprzętu: CPU i GPU z wolnego tekstu ClickUp.
+
+``Model Procesora`` ("8365u", "ryzen 5 pro 4650u", "core i7-1165g7 11gen")
+i ``Grafika`` ("P3200 Quadro", "Nvidia Quadro RTX 3000", "rtx 3000") mają
+wiele zapisów tej samej części. Tu rozkładamy je na producenta, rodzinę,
+generację i sufiks oraz kanoniczny klucz ("Intel Core i5-8365U",
+"NVIDIA Quadro RTX 3000"), po którym grupujemy.
+
+Parsujemy tylko unikalne wartości (kilkaset), wynik rozkładamy na wiersze po
+kodach - całość liczona raz, przy wczytaniu (``data_loader.normalize``).
+"""
+import numpy as np
+import pandas as pd
+
+PROCESSOR_COL = "Procesor (drop down)"
+CPU_MODEL_COL = "Model Procesora (short text)"
+GPU_COL = "Grafika (short text)"
+
+CPU_VENDOR = "CPU_Producent"
+CPU_FAMILY = "CPU_Rodzina"
+CPU_GENERATION = "CPU_Generacja"
+CPU_SUFFIX = "CPU_Sufiks"
+CPU_KEY = "CPU_Klucz"
+GPU_VENDOR = "GPU_Producent"
+GPU_FAMILY = "GPU_Rodzina"
+GPU_MODEL = "GPU_Model"
+GPU_KEY = "GPU_Klucz"
+
+CPU_COLUMNS = [CPU_VENDOR, CPU_FAMILY, CPU_GENERATION, CPU_SUFFIX, CPU_KEY]
+GPU_COLUMNS = [GPU_VENDOR, GPU_FAMILY, GPU_MODEL, GPU_KEY]
+SPEC_COLUMNS = CPU_COLUMNS + GPU_COLUMNS
+# Wszystkie poza generacją (Int8) trzymamy jako category
+SPEC_CATEGORY_COLUMNS = [c for c in SPEC_COLUMNS if c != CPU_GENERATION]
+
+INTEL = "Intel"
+AMD = "AMD"
+NVIDIA = "NVIDIA"
+
+# Ryzen bez podanej serii: druga cyfra numeru modelu (4650 -> 5, 2700 -> 7)
+_RYZEN_TIER = {"1": "3", "2": "3", "3": "3", "4": "3", "5": "5", "6": "5", "7": "7", "8": "7", "9": "9"}
+
+
+def _clean(values: pd.Series) -> pd.Series:
+    return values.astype(object).str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _join(*parts, sep=" ") -> pd.Series:
+    """Sklejenie kolumn tekstowych z pominięciem braków; pusty wynik -> brak."""
+    result = parts[0].fillna("")
+    for part in parts[1:]:
+        result = result.str.cat(part.fillna(""), sep=sep)
+    result = result.str.replace(rf"(?:{sep})+", sep, regex=True).str.strip(sep)
+    return _when(result != "", result)
+
+
+def _when(mask: pd.Series, values) -> pd.Series:
+    """``values`` tam, gdzie ``mask``, w pozostałych wierszach brak."""
+    result = pd.Series(values, index=mask.index, dtype=object)
+    result[~mask] = None
+    return result
+
+
+def _coalesce(*parts) -> pd.Series:
+    """Pierwsza niepusta wartość z kolejnych kolumn."""
+    result = parts[0].astype(object)
+    for part in parts[1:]:
+        missing = result.isna()
+        result[missing] = part[missing]
+    return result
+
+
+def _extract(text: pd.Series, pattern: str) -> pd.DataFrame:
+    # Kolumny tekstowe także wtedy, gdy nic nie pasuje (same braki)
+    return text.str.extract(pattern).astype(object)
+
+
+def parse_cpu(processor: pd.Series, model: pd.Series) -> pd.DataFrame:
+    """Unikalne pary (procesor z listy, model z tekstu) -> kolumny ``CPU_COLUMNS``."""
+    proc = _clean(processor).fillna("")
+    text = _clean(model).fillna("")
+
+    ryzen = text.str.contains(r"ryzen|rayzen|ryzne")
+    xeon = proc.eq("xeon") | text.str.contains(r"xeon|(?:^| )e-\d")
+    ultra = text.str.contains(r"\bultra\b")
+    is_amd = proc.eq("amd") | ryzen
+    is_intel = ~is_amd & (
+        proc.isin(["i3", "i5", "i7", "i9", "xeon"]) | text.str.contains(r"\bcore\b|\bi[3579]\b") | xeon | ultra
+    )
+
+    parts = _extract(text, r"(?<!\d)(?P<number>\d{4,5})(?P<suffix>[a-z]{0,2}\d?)(?![a-z\d])")
+    number = parts["number"]
+    suffix = _when(parts["suffix"].fillna("") != "", parts["suffix"].str.upper())
+
+    # Seria: z tekstu ("i7-1165g7", "ryzen 7 pro", "ultra 5"), potem z listy, potem z numeru
+    intel_tier = _coalesce(
+        _extract(text, r"(?:^|[^a-z])i([3579])(?!\d)")[0],
+        _extract(proc, r"^i([3579])$")[0],
+        _extract(text, r"ultra ?([3579])(?!\d)")[0],
+    )
+    amd_tier = _coalesce(
+        _extract(text, r"(?:ryzen|rayzen|ryzne) ?(?:pro ?)?([3579])(?!\d)")[0],
+        _when(number.str.len() == 4, number.str[1].map(_RYZEN_TIER)),
+    )
+
+    # Generacja: Intel 8365 -> 8, 1145 -> 11, 10210 -> 10; Ryzen 4650 -> 4.
+    # Sama liczba ("8", "11") w polu modelu to generacja wpisana ręcznie.
+    two_digit = (number.str.len() == 5) | ((number.str.len() == 4) & number.str.startswith("1"))
+    intel_generation = _coalesce(
+        _when(two_digit.fillna(False).astype(bool), number.str[:2]),
+        number.str[:1],
+        _extract(text, r"^(\d{1,2})$")[0],
+    )
+    generation = pd.to_numeric(
+        _coalesce(_when(is_intel & ~xeon & ~ultra, intel_generation), _when(is_amd, number.str[:1]))
+    ).astype("Int8")
+
+    vendor = _coalesce(_when(is_intel, INTEL), _when(is_amd, AMD))
+    family = _coalesce(
+        _when(is_amd, _join(_when(is_amd, "Ryzen"), amd_tier)),
+        _when(is_intel & xeon, "Xeon"),
+        _when(is_intel & ultra, _join(_when(ultra, "Core Ultra"), intel_tier)),
+        _when(is_intel, _join(_when(is_intel, "Core"), "i" + intel_tier)),
+    )
+
+    has_number = number.notna()
+    code = number + suffix.fillna("")
+    intel_code = _join(_when(xeon & text.str.contains(r"(?:^| )e-\d"), "E-"), code, sep="")
+    key = _coalesce(
+        _when(is_amd & has_number, _join(vendor, family, code)),
+        _when(is_intel & has_number & ~xeon & ~ultra & intel_tier.notna(), "Intel Core i" + intel_tier + "-" + code),
+        _when(is_intel & has_number, _join(vendor, family, intel_code)),
+        _when(is_intel & generation.notna(), _join(vendor, family) + " " + generation.astype(str) + ". gen."),
+        # Bez numeru modelu zostaje oczyszczony tekst - wiersz nie znika z zestawień
+        _when(text != "", text),
+    )
+
+    return pd.DataFrame({
+        CPU_VENDOR: vendor,
+        CPU_FAMILY: family,
+        CPU_GENERATION: generation,
+        CPU_SUFFIX: _when(has_number, suffix),
+        CPU_KEY: key,
+    })
+
+
+def parse_gpu(values: pd.Series) -> pd.DataFrame:
+    """Unikalne wartości ``Grafika`` -> kolumny ``GPU_COLUMNS``."""
+    text = _clean(values).fillna("")
+
+    rtx = _extract(text, r"rtx ?(?P<a>a?) ?(?P<number>\d{4})")
+    mx = _extract(text, r"mx ?(\d{3})")[0]
+    quadro = _extract(text, r"(?<![a-z])(?P<letter>[pmtk]) ?(?P<number>\d{3,4})(?P<m>m?)(?!\d)")
+    codename = _extract(text, r"(n\d{2}e-q\d|ga\d{3})")[0]
+    radeon = _extract(text, r"(?P<series>r[79]|rx|wx|rl|vega) ?(?P<number>m?\d{1,4}x?)")
+    intel_model = _extract(text, r"(?<!\d)(\d{3})(?!\d)")[0]
+
+    is_intel = text.str.contains(r"intel|uhd|fhd|iris|skylake")
+    is_amd = ~is_intel & text.str.contains(r"radeon|\bamd\b|\brx ?\d|\bwx\b|vega|\br[79] ")
+    is_nvidia = ~is_intel & ~is_amd & (
+        text.str.contains(r"nvidia|quadro|rtx|gtx|geforce") | mx.notna() | quadro["number"].notna() | codename.notna()
+    )
+    is_rtx_a = rtx["a"] == "a"
+
+    # Quadro RTX 3000 vs RTX A3000 (następca Quadro, już bez tej nazwy)
+    nvidia_model = _coalesce(
+        _when(is_rtx_a, "A" + rtx["number"]),
+        "RTX " + rtx["number"],
+        "MX" + mx,
+        quadro["letter"].str.upper() + quadro["number"] + quadro["m"].str.upper(),
+        codename.str.upper(),
+    )
+    nvidia_family = _coalesce(
+        _when(is_rtx_a, "RTX"),
+        _when(rtx["number"].notna() | quadro["number"].notna(), "Quadro"),
+        _when(mx.notna(), "GeForce"),
+    )
+    amd_family = _when(is_amd, "Radeon")
+    amd_family[is_amd & text.str.contains(r"\bwx\b|\bpro\b")] = "Radeon Pro"
+
+    vendor = _coalesce(_when(is_intel, INTEL), _when(is_amd, AMD), _when(is_nvidia, NVIDIA))
+    family = _coalesce(
+        _when(is_nvidia, nvidia_family), amd_family, _when(is_intel & intel_model.notna(), "UHD")
+    )
+    model = _coalesce(
+        _when(is_nvidia, nvidia_model),
+        _when(is_amd, _join(radeon["series"].str.upper(), radeon["number"].str.upper())),
+        _when(is_intel, intel_model),
+    )
+    key = _coalesce(_join(vendor, family, model), _when(text != "", text))
+
+    return pd.DataFrame({GPU_VENDOR: vendor, GPU_FAMILY: family, GPU_MODEL: model, GPU_KEY: key})
+
+
+def _expand(parsed: pd.DataFrame, codes: np.ndarray) -> dict:
+    """Wyniki dla unikalnych wartości -> kolumny na wszystkie wiersze (po kodach)."""
+    columns = {}
+    for col in parsed.columns:
+        values = parsed[col]
+        if values.dtype == object:
+            value_codes, categories = pd.factorize(values)
+            columns[col] = pd.Categorical.from_codes(value_codes[codes], categories=categories)
+        else:
+            columns[col] = values.array.take(codes)
+    return columns
+
+
+def add_specs(df: pd.DataFrame) -> pd.DataFrame:
+    """Dopisuje ``SPEC_COLUMNS`` (gdy są kolumny źródłowe)."""
+    if CPU_MODEL_COL in df.columns:
+        processor = df[PROCESSOR_COL] if PROCESSOR_COL in df.columns else pd.Series(np.nan, index=df.index)
+        processor_codes, processors = pd.factorize(processor, use_na_sentinel=False)
+        model_codes, models = pd.factorize(df[CPU_MODEL_COL], use_na_sentinel=False)
+        pairs, codes = np.unique(processor_codes * len(models) + model_codes, return_inverse=True)
+        parsed = parse_cpu(
+            pd.Series(processors.take(pairs // len(models)), dtype=object),
+            pd.Series(models.take(pairs % len(models)), dtype=object),
+        )
+        df = df.assign(**_expand(parsed, codes))
+    if GPU_COL in df.columns:
+        codes, uniques = pd.factorize(df[GPU_COL], use_na_sentinel=False)
+        df = df.assign(**_expand(parse_gpu(pd.Series(uniques, dtype=object)), codes))
+    return df
+
+
+def cpu_mask(frame: pd.DataFrame, vendor=None, min_generation: int = 0) -> np.ndarray:
+    """Wiersze z CPU danego producenta i generacją >= ``min_generation`` (0 = bez progu)."""
+    mask = np.ones(len(frame), dtype=bool)
+    if vendor is not None:
+        mask &= (frame[CPU_VENDOR] == vendor).to_numpy()
+    if min_generation:
+        mask &= (frame[CPU_GENERATION] >= min_generation).fillna(False).to_numpy(dtype=bool)
+    return mask
@@ -0,0 +1,45 @@
+"""Okno tabeli: sortowanie po stronie serwera i wycinanie tylko widocznej strony.
+
+Kolejność sortowania każdej kolumny liczymy raz na snapshot (kody z
+``pd.factorize(sort=True)``). Dla przefiltrowanego podzbioru wystarczy potem
+przejść po gotowej kolejności i zostawić wiersze z podzbioru - O(n), bez
+ponownego sortowania i bez kopiowania całej przefiltrowanej ramki.
+"""
+import numpy as np
+import pandas as pd
+
+
+class SortIndex:
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._orders = {}
+
+    def order(self, col, ascending: bool = True) -> np.ndarray:
+        """Pozycje wszystkich wierszy posortowane po ``col`` (braki zawsze na końcu)."""
+        key = (col, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            codes, uniques = pd.factorize(self._df[col], sort=True)
+            codes = codes.astype(np.int32)
+            if not ascending:
+                codes = np.where(codes >= 0, len(uniques) - 1 - codes, codes)
+            codes[codes < 0] = len(uniques)
+            order = np.argsort(codes, kind="stable")
+            self._orders[key] = order
+        return order
+
+    def sorted_rows(self, rows: np.ndarray, col=None, ascending: bool = True) -> np.ndarray:
+        if col is None:
+            return rows
+        member = np.zeros(len(self._df), dtype=bool)
+        member[rows] = True
+        order = self.order(col, ascending)
+        return order[member[order]]
+
+
+def window(df: pd.DataFrame, rows: np.ndarray, start: int, stop: int, columns=None) -> pd.DataFrame:
+    """Tylko wiersze ``rows[start:stop]`` i wybrane kolumny."""
+    page_rows = rows[start:stop]
+    if columns is None:
+        return df.take(page_rows)
+    return df.iloc[page_rows, df.columns.get_indexer(columns)]
@@ -0,0 +1,28 @@
+"""Wspólne dane testów: próbka eksportu ClickUp z repozytorium.
+
+    python -m pytest -q
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from data_loader import clear_cache  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, "nazwa_pliku.csv")
+
+
+@pytest.fixture(scope="session")
+def sample_csv() -> str:
+    return SAMPLE_CSV
+
+
+@pytest.fixture(autouse=True)
+def _fresh_snapshot_cache():
+    # Snapshoty z plików tymczasowych nie przechodzą do kolejnych testów
+    yield
+    clear_cache()
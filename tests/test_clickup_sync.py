@@ -0,0 +1,107 @@
+"""Synchronizacja przyrostowa na atrapie API (``mock_clickup``)."""
+import json
+import threading
+import warnings
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from clickup_sync import OVERLAP_MS, ClickUpClient, merge_tasks, sync
+from csv_stream import read_rows
+from data_loader import SEPARATOR, read_export, read_snapshot, snapshot_path
+from mock_clickup import MockClickUp, make_handler
+
+DESTINATION = "Przeznaczenie (drop down)"
+
+
+@pytest.fixture
+def clickup(sample_csv):
+    api = MockClickUp(read_rows(sample_csv, SEPARATOR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(api))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield api, ClickUpClient("", f"http://127.0.0.1:{server.server_port}/api/v2", backoff=0.01)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    # Bez lokalnego eksportu - pierwsza synchronizacja zaczyna od zera
+    return str(tmp_path / "eksport.csv"), str(tmp_path / "sync_state.json")
+
+
+def _synced(csv_path):
+    return read_snapshot(snapshot_path(csv_path)).set_index("Task ID")
+
+
+def test_first_sync_without_local_export_fetches_all_tasks(clickup, paths):
+    api, client = clickup
+    csv_path, state_path = paths
+
+    assert sync(client, "1", csv_path, state_path=state_path) == len(api.tasks)
+    synced = _synced(csv_path)
+    assert synced.index.is_unique
+    assert set(synced.index) == set(api.tasks)
+
+
+def test_updated_task_replaces_older_version(clickup, paths):
+    api, client = clickup
+    csv_path, state_path = paths
+    sync(client, "1", csv_path, state_path=state_path)
+    task_id = list(api.tasks)[5]
+    before = _synced(csv_path).loc[task_id, DESTINATION]
+    new_value = "Sklep" if before != "Sklep" else "Magazyn"
+
+    api.touch(task_id, {DESTINATION: new_value})
+    fetched = sync(client, "1", csv_path, state_path=state_path)
+
+    synced = _synced(csv_path)
+    assert fetched < len(api.tasks)
+    assert len(synced) == len(api.tasks)
+    assert synced.index.is_unique
+    assert synced.loc[task_id, DESTINATION] == new_value
+
+
+def test_change_in_the_last_synced_millisecond_is_not_lost(clickup, paths):
+    api, client = clickup
+    csv_path, state_path = paths
+    sync(client, "1", csv_path, state_path=state_path)
+    with open(state_path, encoding="utf-8") as f:
+        last_updated = json.load(f)["1"]
+
+    # date_updated_gt = ostatni znacznik pominąłby tę zmianę; zakładka OVERLAP_MS ją łapie
+    task_id = list(api.tasks)[0]
+    api.tasks[task_id]["row"][DESTINATION] = "Sklep"
+    api.tasks[task_id]["date_updated"] = last_updated
+    sync(client, "1", csv_path, state_path=state_path)
+
+    assert _synced(csv_path).loc[task_id, DESTINATION] == "Sklep"
+    window = [e for e in api.tasks.values() if e["date_updated"] > last_updated - OVERLAP_MS]
+    assert len(window) < len(api.tasks)
+
+
+def test_new_drop_down_option_reaches_the_snapshot(clickup, paths):
+    api, client = clickup
+    csv_path, state_path = paths
+    sync(client, "1", csv_path, state_path=state_path)
+    task_id = list(api.tasks)[1]
+
+    api.touch(task_id, {DESTINATION: "Serwis zewnętrzny"})
+    sync(client, "1", csv_path, state_path=state_path)
+
+    assert _synced(csv_path).loc[task_id, DESTINATION] == "Serwis zewnętrzny"
+
+
+def test_merge_with_empty_custom_fields_keeps_dtypes(sample_csv):
+    base = read_export(sample_csv)
+    api = MockClickUp(read_rows(sample_csv, SEPARATOR))
+    # Pojedyncze zadanie - część pól własnych jest pusta w całej partii
+    tasks = [api.task_json(list(api.tasks)[0])]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        merged = merge_tasks(base, tasks)
+
+    assert len(merged) == len(base)
+    assert merged.dtypes.to_dict() == base.dtypes.to_dict()
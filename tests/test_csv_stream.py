@@ -0,0 +1,74 @@
+"""Import eksportu: złe wiersze trafiają do pliku odrzuconych, nie znikają po cichu."""
+import csv
+import os
+
+import pytest
+
+from csv_stream import EXPORT_COLUMNS, REJECT_HEADER, TASK_ID, IngestReport, SchemaError, read_rows
+from data_loader import SEPARATOR, get_snapshot, snapshot_path
+from ingest import stream_to_snapshot
+
+GOOD_ROWS = 50
+
+
+@pytest.fixture
+def broken_csv(tmp_path, sample_csv):
+    """Próbka eksportu + wiersz z brakującym polem i wiersz bez Task ID."""
+    rows = read_rows(sample_csv, SEPARATOR).head(GOOD_ROWS).fillna("")
+    path = tmp_path / "eksport.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows.itertuples(index=False):
+            # Jeden rekord = jedna linia, żeby numery linii w raporcie były przewidywalne
+            writer.writerow([str(v).replace("\n", " ") for v in row])
+        writer.writerow(["zly_wiersz", "za mało pól"])
+        writer.writerow(["", *rows.iloc[0, 1:]])
+    return str(path)
+
+
+def test_sample_export_has_no_rejected_rows(sample_csv):
+    report = IngestReport()
+    rows = read_rows(sample_csv, SEPARATOR, report=report)
+
+    assert report.rows_rejected == 0
+    assert report.rows_ok == len(rows) == report.rows_read
+    assert list(rows.columns) == EXPORT_COLUMNS
+
+
+def test_malformed_rows_go_to_rejects_file(tmp_path, broken_csv):
+    report = IngestReport()
+    rejects_to = str(tmp_path / "odrzucone.csv")
+    rows = read_rows(broken_csv, SEPARATOR, report=report, rejects_to=rejects_to)
+
+    assert len(rows) == GOOD_ROWS
+    assert rows[TASK_ID].notna().all()
+    assert report.rows_read == GOOD_ROWS + 2
+    assert report.rejected == {"zła liczba pól": 1, "brak Task ID": 1}
+
+    with open(rejects_to, encoding="utf-8", newline="") as f:
+        rejects = list(csv.reader(f))
+    assert rejects[0] == REJECT_HEADER
+    # Nagłówek to linia 1, dobre wiersze 2..GOOD_ROWS + 1
+    assert [int(r[0]) for r in rejects[1:]] == [GOOD_ROWS + 2, GOOD_ROWS + 3]
+    assert rejects[1][2:] == ["zly_wiersz", "za mało pól"]
+
+
+def test_snapshot_keeps_rejected_count(tmp_path, broken_csv):
+    report = stream_to_snapshot(broken_csv, snapshot_path(broken_csv), SEPARATOR,
+                                rejects_to=str(tmp_path / "odrzucone.csv"))
+
+    snapshot = get_snapshot(broken_csv, SEPARATOR)
+    assert report.rows_rejected == 2
+    assert snapshot.rejected == 2
+    assert len(snapshot.df) == GOOD_ROWS
+
+
+def test_changed_header_is_refused_without_partial_snapshot(tmp_path):
+    path = str(tmp_path / "eksport.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows([[*EXPORT_COLUMNS[:-1], "Nowa kolumna"], ["1"] * len(EXPORT_COLUMNS)])
+
+    with pytest.raises(SchemaError, match="Nowa kolumna"):
+        stream_to_snapshot(path, snapshot_path(path), SEPARATOR)
+    assert sorted(os.listdir(tmp_path)) == ["eksport.csv"]
@@ -0,0 +1,67 @@
+"""Historia importów: deduplikacja wierszy i diff po skrótach."""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from csv_stream import read_rows
+from data_loader import SEPARATOR
+from history import DESTINATION_COL, SHELF_COL, TASK_ID, HistoryStore
+
+NOTES_COL = "Uwagi (text)"
+
+
+@pytest.fixture
+def imports(sample_csv):
+    """Dwa importy: drugi bez dwóch zadań, z jednym nowym i trzema zmienionymi."""
+    before = read_rows(sample_csv, SEPARATOR)
+    ids = before[TASK_ID].tolist()
+
+    after = before[~before[TASK_ID].isin(ids[:2])].reset_index(drop=True)
+    added = before.iloc[[10]].assign(**{TASK_ID: "nowe_zadanie"})
+    after = pd.concat([after, added], ignore_index=True)
+    task_ids = after[TASK_ID].to_numpy()
+    after.loc[task_ids == ids[2], SHELF_COL] = "99"
+    after.loc[task_ids == ids[3], DESTINATION_COL] = "Serwis zewnętrzny"
+    after.loc[task_ids == ids[4], NOTES_COL] = "nowa uwaga"
+    changes = {"removed": ids[:2], "moved": ids[2], "destination": ids[3], "notes": ids[4]}
+    return before, after, changes
+
+
+def test_diff_detects_added_removed_and_changed_rows(tmp_path, imports):
+    before, after, changes = imports
+    store = HistoryStore(str(tmp_path))
+    old_id = store.add(before, datetime(2026, 5, 28, 8))
+    new_id = store.add(after, datetime(2026, 5, 29, 8))
+
+    diff = store.diff(old_id, new_id)
+
+    assert diff.added[TASK_ID].tolist() == ["nowe_zadanie"]
+    assert sorted(diff.removed[TASK_ID]) == sorted(changes["removed"])
+    assert diff.moved[TASK_ID].tolist() == [changes["moved"]]
+    assert diff.moved["po"].tolist() == ["99"]
+    assert diff.destination_changed[TASK_ID].tolist() == [changes["destination"]]
+    assert diff.changed[TASK_ID].tolist() == [changes["notes"]]
+
+
+def test_unchanged_rows_are_stored_once(tmp_path, imports):
+    before, after, changes = imports
+    store = HistoryStore(str(tmp_path))
+    old_id = store.add(before, datetime(2026, 5, 28, 8))
+    new_id = store.add(after, datetime(2026, 5, 29, 8))
+
+    snapshots = store.snapshots().set_index("id")
+    assert snapshots.loc[old_id, "nowe_wiersze"] == len(before)
+    # Nowe zadanie + trzy zmienione; reszta wskazuje na wiersze z pierwszego importu
+    assert snapshots.loc[new_id, "nowe_wiersze"] == 4
+    loaded = store.load(new_id, task_ids=[changes["notes"]], columns=[NOTES_COL])
+    assert loaded[NOTES_COL].tolist() == ["nowa uwaga"]
+
+
+def test_identical_import_is_not_stored_again(tmp_path, imports):
+    before, _, _ = imports
+    store = HistoryStore(str(tmp_path))
+    first_id = store.add(before, datetime(2026, 5, 28, 8))
+
+    assert store.add(before.copy(), datetime(2026, 5, 29, 8)) == first_id
+    assert len(store.snapshots()) == 1
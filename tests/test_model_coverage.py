@@ -0,0 +1,106 @@
+"""Pokrycie katalogu: puste pole = dowolna wartość, "brak" = pole puste w danych."""
+import io
+
+import pytest
+
+from aggregations import COUNT, build_config_cube
+from data_loader import SEPARATOR, get_snapshot, read_export
+from model_coverage import (
+    COVERED,
+    GPU_KEY,
+    IN_CATALOG_COL,
+    MISSING,
+    NO_VALUE,
+    STATUS_COL,
+    UNDERSTOCKED,
+    Catalog,
+    coverage,
+    load_catalog,
+    read_catalog,
+    snapshot_coverage,
+    stock_configurations,
+)
+
+ANY_CONFIG = "[lenovo thinkpad t14 gen 1]"
+NO_GPU = "[dell latitude 5500]"
+TOO_FEW = "[hp elitebook 840 g8]"
+UNKNOWN = "[nie ma takiego laptopa]"
+
+
+@pytest.fixture(scope="module")
+def cube(sample_csv):
+    return build_config_cube(read_export(sample_csv, SEPARATOR))
+
+
+@pytest.fixture(scope="module")
+def stock(cube):
+    return stock_configurations(cube)
+
+
+@pytest.fixture(scope="module")
+def catalog_csv(stock) -> bytes:
+    too_few = int(stock.loc[stock["tags"] == TOO_FEW, COUNT].sum())
+    return "\n".join([
+        "tags,CPU_Klucz,GPU_Klucz,Dotyk_flag,Minimum sztuk",
+        "Lenovo ThinkPad T14 Gen 1,,,,1",  # wielkość liter i nawiasy bez znaczenia
+        f"{NO_GPU},,brak,,1",
+        f"{TOO_FEW},,,,{too_few + 1}",
+        f"{UNKNOWN},,,,1",
+    ]).encode()
+
+
+@pytest.fixture(scope="module")
+def report(cube, catalog_csv):
+    return coverage(cube, read_catalog(io.BytesIO(catalog_csv)))
+
+
+def _expected(report, tag):
+    rows = report.expected[report.expected["tags"] == tag]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+
+def test_empty_catalog_fields_match_any_configuration(report, stock):
+    row = _expected(report, ANY_CONFIG)
+    assert row[COUNT] == stock.loc[stock["tags"] == ANY_CONFIG, COUNT].sum()
+    assert row[STATUS_COL] == COVERED
+
+
+def test_brak_matches_only_items_without_the_value(report, stock):
+    row = _expected(report, NO_GPU)
+    without_gpu = (stock["tags"] == NO_GPU) & (stock[GPU_KEY] == NO_VALUE)
+    assert 0 < row[COUNT] < stock.loc[stock["tags"] == NO_GPU, COUNT].sum()
+    assert row[COUNT] == stock.loc[without_gpu, COUNT].sum()
+
+
+def test_missing_and_understocked_rows(report):
+    missing = _expected(report, UNKNOWN)
+    assert missing[STATUS_COL] == MISSING
+    assert missing[COUNT] == 0
+    assert _expected(report, TOO_FEW)[STATUS_COL] == UNDERSTOCKED
+    assert report.summary()[MISSING] == 1
+
+
+def test_unexpected_is_the_stock_no_catalog_row_matches(report, stock):
+    unexpected = report.unexpected
+    # Wiersze z pustymi polami obejmują wszystkie konfiguracje modelu
+    assert not unexpected["tags"].isin([ANY_CONFIG, TOO_FEW]).any()
+    # "brak" grafiki: konfiguracje tego modelu z grafiką są spoza katalogu
+    with_gpu = (stock["tags"] == NO_GPU) & (stock[GPU_KEY] != NO_VALUE)
+    same_model = unexpected["tags"] == NO_GPU
+    assert unexpected.loc[same_model, COUNT].sum() == stock.loc[with_gpu, COUNT].sum()
+    assert unexpected.loc[same_model, IN_CATALOG_COL].all()
+    other_models = ~stock["tags"].isin([ANY_CONFIG, TOO_FEW, NO_GPU])
+    assert unexpected[COUNT].sum() == stock.loc[other_models | with_gpu, COUNT].sum()
+
+
+def test_snapshot_coverage_is_cached_per_catalog_version(sample_csv, catalog_csv):
+    snapshot = get_snapshot(sample_csv, SEPARATOR)
+    catalog = load_catalog(catalog_csv)
+
+    first = snapshot_coverage(snapshot, catalog)
+    assert snapshot_coverage(snapshot, catalog) is first
+
+    smaller = Catalog(catalog.rows.head(1), catalog.version + "-1", catalog.source)
+    assert len(snapshot_coverage(snapshot, smaller).expected) == 1
+    assert snapshot_coverage(snapshot, catalog) is first
@@ -0,0 +1,360 @@
+"""Wspólne widgety Streamlit dla stron magazynu."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from csv_stream import SchemaError, reject_path
+from data_loader import FILE_PATH, SEPARATOR, get_snapshot, source_columns
+from export import EXPORT_FORMATS, available_formats, export_bytes, filter_state_key
+from filter_index import ALL, FILTER_COLUMNS, MULTI_FILTERS, FilterIndex, filters_from_params, selections_from_params
+from labels import LABEL_FILTERS, build_label_matrices, label_filter_mask
+from result_cache import shared_cache
+from search import SEARCH_PARAM, SearchIndex, rank
+from table_view import SortIndex, window
+
+# Parametr URL -> etykieta widgetu w sidebarze
+FILTER_LABELS = {
+    "tag": "Wybierz tag",
+    "processor": "Wybierz procesor",
+    "processor_model": "Wybierz model procesora",
+    "resolution": "Wybierz rozdzielczość",
+    "destinations": "Wybierz przeznaczenie",
+    "list": "Wybierz listę",
+}
+
+PAGE_SIZES = [50, 100, 250, 500, 1000]
+PAGE_ROW_CAP = 1000
+
+
+def _is_all(value) -> bool:
+    return isinstance(value, str) and value == ALL
+
+
+def _position(options, value):
+    for i, option in enumerate(options):
+        if option is value or (pd.isna(option) and pd.isna(value)) or option == value:
+            return i
+    return None
+
+
+def _current_selection(index, name, default):
+    # Wartość widgetu z poprzedniego przebiegu (albo z URL przy pierwszym wejściu);
+    # wartości spoza danych traktujemy jak brak filtra
+    col = FILTER_COLUMNS[name]
+    value = st.session_state.get(f"filter_{name}", default)
+    if name in MULTI_FILTERS:
+        return [v for v in value if index.is_known(col, v)]
+    if _is_all(value) or not index.is_known(col, value):
+        return ALL
+    return value
+
+
+def _format_with_counts(facet):
+    counts = {value: count for value, count in facet if not pd.isna(value)}
+    na_count = next((count for value, count in facet if pd.isna(value)), 0)
+
+    def format_func(value):
+        if _is_all(value):
+            return ALL
+        count = na_count if pd.isna(value) else counts.get(value, 0)
+        return f"{value} ({count})"
+
+    return format_func
+
+
+def sidebar_filters(index, query_params: dict, extra=None, where=st.sidebar,
+                    version: str = None, extra_state: dict = None) -> dict:
+    """Filtry sidebaru z facetami: każda lista pokazuje tylko wartości osiągalne
+    przy pozostałych aktywnych filtrach, razem z liczbą sztuk.
+
+    ``extra`` to dodatkowa maska wierszy (np. filtr etykiet) uwzględniana
+    w licznikach, ``extra_state`` - wybory, z których powstała. Z ``version``
+    (wersja snapshotu) facety trafiają do wspólnego cache wyników.
+    Zwraca wybory w postaci ``{parametr URL: wartość}``.
+    """
+    defaults = filters_from_params(query_params)
+    current = {name: _current_selection(index, name, defaults[name]) for name in FILTER_COLUMNS}
+    if version is None:
+        facets = index.facets(selections_from_params(current), extra)
+    else:
+        facets = shared_cache().get_or_compute(
+            "facets", version, {**current, **(extra_state or {})},
+            lambda: index.facets(selections_from_params(current), extra),
+        )
+
+    selected = {}
+    for name, col in FILTER_COLUMNS.items():
+        facet = facets[col]
+        options = [value for value, _ in facet]
+        format_func = _format_with_counts(facet)
+
+        if name in MULTI_FILTERS:
+            # Wybrane wartości zostają na liście, nawet jeśli teraz dają 0 sztuk
+            options += [v for v in current[name] if _position(options, v) is None]
+            selected[name] = where.multiselect(
+                FILTER_LABELS[name],
+                options,
+                default=[options[_position(options, v)] for v in current[name]],
+                format_func=format_func,
+                key=f"filter_{name}",
+            )
+            continue
+
+        options = [ALL] + options
+        if _position(options, current[name]) is None:
+            options.append(current[name])
+        selected[name] = where.selectbox(
+            FILTER_LABELS[name],
+            options,
+            index=_position(options, current[name]),
+            format_func=format_func,
+            key=f"filter_{name}",
+        )
+    return selected
+
+
+def sidebar_label_filters(matrices: dict, query_params: dict, where=st.sidebar) -> dict:
+    """Multiselecty etykiet (dokładne dopasowanie, wiersz musi mieć wszystkie wybrane)."""
+    selected = {}
+    for name, col in LABEL_FILTERS.items():
+        if col not in matrices:
+            continue
+        vocabulary = matrices[col].vocabulary.tolist()
+        selected[name] = where.multiselect(
+            col.replace(" (labels)", ""),
+            vocabulary,
+            default=[v for v in query_params.get(name, []) if v in vocabulary],
+            key=f"labels_{name}",
+        )
+    return selected
+
+
+def search_box(query_params: dict, where=st.sidebar) -> str:
+    """Pole wyszukiwania (numer seryjny, zamówienie, uwagi); wartość startowa z ``?q=``."""
+    return where.text_input(
+        "🔍 Szukaj (numer seryjny, zamówienie, uwagi)",
+        value=query_params.get(SEARCH_PARAM, [""])[0],
+        key="search",
+    ).strip()
+
+
+def url_params() -> dict:
+    """Parametry URL jako ``{nazwa: [wartości]}`` (jak w API), z ``st.query_params``."""
+    return {name: st.query_params.get_all(name) for name in st.query_params}
+
+
+def share_button(params: dict, where=st.sidebar):
+    """Zapisuje filtry w URL - link z paska przeglądarki odtwarza ten sam widok."""
+    if where.button("Kliknij aby udostępnić"):
+        st.query_params.from_dict({name: values for name, values in params.items() if values})
+        where.success("Filtry zapisane!")
+        where.info("Skopiuj URL z paska przeglądarki.")
+
+
+def filtered_items(snapshot, profiler, query_params: dict, labels: bool = True) -> np.ndarray:
+    """Wspólny widok pozycji: wyszukiwanie, filtry z facetami (opcjonalnie etykiety),
+    link do udostępnienia, tabela stronicowana i eksport.
+
+    Maska etykiet/wyszukiwania i przefiltrowane wiersze trafiają do wspólnego
+    cache wyników - ten sam link liczony raz na wersję danych, dla wszystkich
+    sesji i stron. Zwraca pozycje (iloc) przefiltrowanych wierszy.
+    """
+    df = snapshot.df
+    results = shared_cache()
+
+    st.sidebar.header("Filtry")
+    query = search_box(query_params)
+
+    # Indeks filtrów, zdekodowane etykiety i indeks wyszukiwania - liczone raz na snapshot
+    with profiler.stage("normalize", rows_in=len(df)):
+        filter_index = snapshot.derived("filter_index", FilterIndex)
+        label_matrices = snapshot.derived("label_matrices", build_label_matrices) if labels else None
+        search_index = snapshot.derived("search_index", SearchIndex) if query else None
+
+    with profiler.stage("filter", rows_in=len(df)) as stage:
+        # Filtry z facetami - listy pokazują tylko wartości osiągalne przy
+        # pozostałych filtrach, z liczbą sztuk
+        main_filters = st.sidebar.container()
+
+        selected_labels = {}
+        if labels:
+            # Filtry etykiet - dokładne dopasowanie na zdekodowanych listach etykiet
+            with st.sidebar.expander("Filtry etykiet", expanded=False):
+                selected_labels = sidebar_label_filters(label_matrices, query_params, where=st)
+        extra_state = {**selected_labels, SEARCH_PARAM: query}
+
+        def label_and_search_mask():
+            extra = label_filter_mask(label_matrices, selected_labels) if labels else None
+            # Wyszukiwanie zawęża wiersze tak jak filtry etykiet (także liczności w facetach)
+            scores = search_index.scores(query) if query else None
+            if scores is not None:
+                extra = scores > 0 if extra is None else extra & (scores > 0)
+            return extra, scores
+
+        extra, search_scores = results.get_or_compute(
+            "items_extra", snapshot.version, extra_state, label_and_search_mask
+        )
+        selected = sidebar_filters(filter_index, query_params, extra=extra, where=main_filters,
+                                   version=snapshot.version, extra_state=extra_state)
+
+        def filter_rows():
+            # Jeden przebieg po bitmapach indeksu, jedno cięcie DataFrame
+            rows = filter_index.rows(selections_from_params(selected), extra=extra)
+            if search_scores is not None:
+                # Wyniki wyszukiwania od najtrafniejszych
+                rows = rank(rows, search_scores)
+            return rows
+
+        state = {**selected, **extra_state}
+        filtered_rows = results.get_or_compute("items_rows", snapshot.version, state, filter_rows)
+        stage.rows_out = len(filtered_rows)
+
+    share_button({
+        **{name: value if name in MULTI_FILTERS else [value] for name, value in selected.items()},
+        **selected_labels,
+        SEARCH_PARAM: [query] if query else [],
+    })
+
+    columns = source_columns(df)
+
+    st.write("### Przefiltrowane dane")
+    with profiler.stage("render", rows_in=len(filtered_rows)):
+        # Do przeglądarki trafia tylko bieżąca strona; sortowanie po stronie serwera
+        paged_table(df, filtered_rows, snapshot.derived("sort_index", SortIndex),
+                    key="filtered_table", columns=columns)
+    st.write(f"Liczba pokazywanych pozycji: {len(filtered_rows)}")
+
+    # Eksport - plik budowany w pamięci dopiero na żądanie, zapamiętany per stan filtrów
+    with profiler.stage("export", rows_in=len(filtered_rows)):
+        export_widget(
+            lambda: window(df, filtered_rows, 0, len(filtered_rows), columns),
+            n_rows=len(filtered_rows),
+            state=state,
+            version=snapshot.version,
+            file_stem="filtered_data",
+            key="filtered_export",
+        )
+    return filtered_rows
+
+
+def _cached_export(key: str, version: str, state: dict, fmt: str, sheet_name: str, get_df) -> bytes:
+    # get_df nie wchodzi do klucza - dane identyfikuje wersja snapshotu + stan filtrów;
+    # plik jest wspólny dla wszystkich sesji otwierających ten sam link
+    def build():
+        with st.spinner("Przygotowuję plik..."):
+            return export_bytes(get_df(), fmt, sheet_name)
+
+    return shared_cache().get_or_compute(
+        f"export_{key}", version, {**state, "_format": fmt, "_sheet": sheet_name}, build
+    )
+
+
+def export_widget(get_df, n_rows: int, state: dict, version: str, file_stem: str,
+                  key: str, sheet_name: str = "Sheet1", label: str = "Pobierz dane jako"):
+    """Plik do pobrania generowany dopiero na żądanie, zapamiętany per stan filtrów.
+
+    ``get_df`` to funkcja zwracająca dane - ramka powstaje dopiero przy eksporcie.
+    """
+    formats = available_formats(n_rows)
+    fmt = st.radio("Format pliku", formats, horizontal=True, key=f"{key}_format")
+    state_key = filter_state_key(state)
+
+    prepared_key = f"{key}_prepared"
+    if st.button("Przygotuj plik do pobrania", key=f"{key}_prepare"):
+        st.session_state[prepared_key] = (state_key, fmt)
+
+    # Po zmianie filtrów przycisk pobierania znika, dopóki plik nie zostanie przygotowany ponownie
+    if st.session_state.get(prepared_key) == (state_key, fmt):
+        export_format = EXPORT_FORMATS[fmt]
+        st.download_button(
+            label=f"{label} {fmt}",
+            data=_cached_export(key, version, state, fmt, sheet_name, get_df),
+            file_name=f"{file_stem}.{export_format.extension}",
+            mime=export_format.mime,
+            key=f"{key}_download",
+        )
+
+
+def paged_table(df: pd.DataFrame, rows, sort_index, key: str, columns=None,
+                height: int = 500, max_rows: int = PAGE_ROW_CAP):
+    """Tabela stronicowana: do przeglądarki trafia tylko bieżąca strona i wybrane kolumny.
+
+    ``rows`` to pozycje (iloc) przefiltrowanych wierszy w ``df``, ``sort_index``
+    - ``SortIndex`` snapshotu (sortowanie po stronie serwera).
+    """
+    all_columns = list(columns or df.columns)
+    settings, paging = st.columns([3, 1])
+    with settings:
+        visible = st.multiselect("Kolumny", all_columns, default=all_columns, key=f"{key}_columns")
+        sort_col, sort_dir = st.columns(2)
+        sort_by = sort_col.selectbox("Sortuj wg", ["(bez sortowania)"] + all_columns, key=f"{key}_sort")
+        ascending = sort_dir.radio(
+            "Kierunek", ["rosnąco", "malejąco"], horizontal=True, key=f"{key}_dir"
+        ) == "rosnąco"
+    with paging:
+        sizes = [s for s in PAGE_SIZES if s <= max_rows] or [max_rows]
+        page_size = st.selectbox("Wierszy na stronę", sizes, index=min(1, len(sizes) - 1), key=f"{key}_size")
+        n_pages = max(1, -(-len(rows) // page_size))
+        page = st.number_input(f"Strona (z {n_pages})", 1, n_pages, 1, key=f"{key}_page")
+
+    if sort_by in all_columns:
+        rows = sort_index.sorted_rows(rows, sort_by, ascending)
+    start = (page - 1) * page_size
+    stop = min(start + page_size, len(rows))
+    st.dataframe(window(df, rows, start, stop, visible or all_columns), height=height, use_container_width=True)
+    st.caption(f"Wiersze {start + 1 if stop else 0}–{stop} z {len(rows)}")
+
+
+def load_data(profiler, required_columns=("tags",), file_path: str = FILE_PATH, sep: str = SEPARATOR):
+    """Wspólny snapshot danych dla stron (jeden na proces, tylko do odczytu).
+
+    Przy błędzie wczytania albo braku wymaganych kolumn pokazuje komunikat
+    i zatrzymuje stronę.
+    """
+    try:
+        with profiler.stage("load") as stage:
+            snapshot = get_snapshot(file_path, sep)
+            stage.rows_out = len(snapshot.df)
+    except FileNotFoundError:
+        st.error(f"Nie znaleziono pliku: {file_path}. Upewnij się, że plik znajduje się w folderze z kodem.")
+        st.stop()
+    except (pd.errors.ParserError, SchemaError) as e:
+        st.error(f"Błąd parsowania pliku CSV: {e}")
+        st.stop()
+    except UnicodeDecodeError as e:
+        st.error(f"Błąd kodowania: {e}")
+        st.stop()
+    except Exception as e:
+        st.error(f"Błąd przy wczytywaniu pliku: {e}")
+        st.stop()
+
+    missing = [c for c in required_columns if c not in snapshot.df.columns]
+    if missing:
+        st.error("Brakuje wymaganych kolumn w pliku CSV:\n" + ", ".join(missing))
+        st.stop()
+
+    st.success(f"Plik `{file_path}` został wczytany poprawnie.")
+    rejected_rows_warning(snapshot, file_path)
+    return snapshot
+
+
+def rejected_rows_warning(snapshot, file_path: str, where=st):
+    """Ostrzeżenie, gdy przy wczytaniu eksportu odrzucono wiersze."""
+    if snapshot.rejected:
+        where.warning(
+            f"Pominięto {snapshot.rejected} błędnych wierszy eksportu. "
+            f"Lista z numerami linii: `python ingest.py {file_path}` -> plik `{reject_path(file_path)}`."
+        )
+
+
+def profiler_panel(profiler):
+    """Panel diagnostyczny w sidebarze (tylko gdy profiler jest włączony)."""
+    stages = profiler.finish()
+    if not profiler.enabled:
+        return
+    with st.sidebar.expander("⏱️ Profil przebiegu", expanded=True):
+        st.dataframe(pd.DataFrame(stages), hide_index=True, use_container_width=True)
+        caption = f"Razem: {sum(s['ms'] for s in stages):.1f} ms"
+        if profiler.peak_rss_mb is not None:
+            caption += f", najwyższy RSS w przebiegu: {profiler.peak_rss_mb:.0f} MB"
+        st.caption(caption)